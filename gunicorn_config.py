@@ -2,7 +2,10 @@ command = '/usr/bin/gunicorn'
 pythonpath = './netbox/'
 timeout = 30
 workers = 3
+worker_class = 'gthread'
+threads = 4
+preload_app = True
 errorlog = '-'
-accesslog = '-'
+accesslog = None
 capture_output = False
-log_level = 'debug'
\ No newline at end of file
+loglevel = 'info'
@@ -7,7 +7,7 @@ from dcim.api.nested_serializers import NestedCableSerializer, NestedSiteSeriali
 from dcim.api.serializers import ConnectedEndpointSerializer
 from extras.api.customfields import CustomFieldModelSerializer
 from tenancy.api.nested_serializers import NestedTenantSerializer
-from utilities.api import ChoiceField, ValidatedModelSerializer
+from utilities.api import ChoiceField, TaggedObjectListSerializer, ValidatedModelSerializer
 from .nested_serializers import *
 
 
@@ -21,6 +21,7 @@ class ProviderSerializer(TaggitSerializer, CustomFieldModelSerializer):
 
     class Meta:
         model = Provider
+        list_serializer_class = TaggedObjectListSerializer
         fields = [
             'id', 'name', 'slug', 'asn', 'account', 'portal_url', 'noc_contact', 'admin_contact', 'comments', 'tags',
             'custom_fields', 'created', 'last_updated', 'circuit_count',
@@ -48,6 +49,7 @@ class CircuitSerializer(TaggitSerializer, CustomFieldModelSerializer):
 
     class Meta:
         model = Circuit
+        list_serializer_class = TaggedObjectListSerializer
         fields = [
             'id', 'cid', 'provider', 'type', 'status', 'tenant', 'install_date', 'commit_rate', 'description',
             'comments', 'tags', 'custom_fields', 'created', 'last_updated',
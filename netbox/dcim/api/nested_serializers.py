@@ -1,3 +1,5 @@
+from collections import OrderedDict
+
 from rest_framework import serializers
 
 from dcim.constants import CONNECTION_STATUS_CHOICES
@@ -87,6 +89,19 @@ class NestedRackSerializer(WritableNestedSerializer):
         model = Rack
         fields = ['id', 'url', 'name', 'display_name', 'device_count']
 
+    def to_representation(self, instance):
+        # Nested racks are rendered for every device and many other objects, so build the representation directly rather
+        # than through the generic field loop. (device_count is present only where the queryset has been annotated.)
+        data = OrderedDict([
+            ('id', instance.pk),
+            ('url', self.fields['url'].to_representation(instance)),
+            ('name', instance.name),
+            ('display_name', instance.display_name),
+        ])
+        if hasattr(instance, 'device_count'):
+            data['device_count'] = instance.device_count
+        return data
+
 
 #
 # Device types
@@ -158,6 +173,16 @@ class NestedDeviceSerializer(WritableNestedSerializer):
         model = Device
         fields = ['id', 'url', 'name', 'display_name']
 
+    def to_representation(self, instance):
+        # Nested devices are rendered for every device component and many other objects, so build the representation
+        # directly rather than through the generic field loop.
+        return OrderedDict([
+            ('id', instance.pk),
+            ('url', self.fields['url'].to_representation(instance)),
+            ('name', instance.name),
+            ('display_name', instance.display_name),
+        ])
+
 
 class NestedConsoleServerPortSerializer(WritableNestedSerializer):
     url = serializers.HyperlinkedIdentityField(view_name='dcim-api:consoleserverport-detail')
@@ -1,9 +1,15 @@
+from collections import OrderedDict
+from functools import lru_cache
+
 from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count
+from django.utils.functional import cached_property
 from drf_yasg.utils import swagger_serializer_method
 from rest_framework import serializers
 from rest_framework.validators import UniqueTogetherValidator
 from taggit_serializer.serializers import TaggitSerializer, TagListSerializerField
 
+from circuits.models import Circuit
 from dcim.constants import *
 from dcim.models import (
     Cable, ConsolePort, ConsolePortTemplate, ConsoleServerPort, ConsoleServerPortTemplate, Device, DeviceBay,
@@ -14,28 +20,54 @@ from dcim.models import (
 )
 from extras.api.customfields import CustomFieldModelSerializer
 from ipam.api.nested_serializers import NestedIPAddressSerializer, NestedVLANSerializer
-from ipam.models import VLAN
+from ipam.models import Prefix, VLAN
 from tenancy.api.nested_serializers import NestedTenantSerializer
 from users.api.nested_serializers import NestedUserSerializer
 from utilities.api import (
-    ChoiceField, ContentTypeField, SerializedPKRelatedField, TimeZoneField, ValidatedModelSerializer,
-    WritableNestedSerializer, get_serializer_for_model,
+    ChoiceField, ContentTypeField, CountAnnotationMixin, SerializedPKRelatedField, TaggedObjectListSerializer,
+    TimeZoneField, ValidatedModelSerializer, WritableNestedSerializer, get_serializer_for_model,
 )
+from utilities.utils import get_subquery
 from virtualization.api.nested_serializers import NestedClusterSerializer
+from virtualization.models import VirtualMachine
 from .nested_serializers import *
 
 
+@lru_cache(maxsize=None)
+def _get_endpoint_type(model):
+    """
+    Return the '<app_label>.<model_name>' label for a connected endpoint model. This is fixed per model, so it is built
+    only once rather than for every object rendered.
+    """
+    return '{}.{}'.format(model._meta.app_label, model._meta.model_name)
+
+
 class ConnectedEndpointSerializer(ValidatedModelSerializer):
     connected_endpoint_type = serializers.SerializerMethodField(read_only=True)
     connected_endpoint = serializers.SerializerMethodField(read_only=True)
     connection_status = ChoiceField(choices=CONNECTION_STATUS_CHOICES, read_only=True)
 
+    def _get_connected_endpoint(self, obj):
+        """
+        Resolve the connected endpoint of an object. The result is cached for the most recently seen object, since both
+        connected_endpoint_type and connected_endpoint are rendered from it.
+        """
+        cached = getattr(self, '_connected_endpoint_cache', None)
+        if cached is None or cached[0] is not obj:
+            # Whether the model defines connected_endpoint at all is determined from the class, without touching the
+            # instance. A reverse one-to-one relation may still raise DoesNotExist (an AttributeError) on the instance.
+            if hasattr(type(obj), 'connected_endpoint'):
+                endpoint = getattr(obj, 'connected_endpoint', None)
+            else:
+                endpoint = None
+            cached = (obj, endpoint)
+            self._connected_endpoint_cache = cached
+        return cached[1]
+
     def get_connected_endpoint_type(self, obj):
-        if hasattr(obj, 'connected_endpoint') and obj.connected_endpoint is not None:
-            return '{}.{}'.format(
-                obj.connected_endpoint._meta.app_label,
-                obj.connected_endpoint._meta.model_name
-            )
+        endpoint = self._get_connected_endpoint(obj)
+        if endpoint is not None:
+            return _get_endpoint_type(type(endpoint))
         return None
 
     @swagger_serializer_method(serializer_or_field=serializers.DictField)
@@ -43,12 +75,13 @@ class ConnectedEndpointSerializer(ValidatedModelSerializer):
         """
         Return the appropriate serializer for the type of connected object.
         """
-        if getattr(obj, 'connected_endpoint', None) is None:
+        endpoint = self._get_connected_endpoint(obj)
+        if endpoint is None:
             return None
 
-        serializer = get_serializer_for_model(obj.connected_endpoint, prefix='Nested')
-        context = {'request': self.context['request']}
-        data = serializer(obj.connected_endpoint, context=context).data
+        serializer = get_serializer_for_model(endpoint, prefix='Nested')
+        context = self._child_context
+        data = serializer(endpoint, context=context).data
 
         return data
 
@@ -57,16 +90,20 @@ class ConnectedEndpointSerializer(ValidatedModelSerializer):
 # Regions/sites
 #
 
-class RegionSerializer(serializers.ModelSerializer):
+class RegionSerializer(CountAnnotationMixin, serializers.ModelSerializer):
     parent = NestedRegionSerializer(required=False, allow_null=True)
     site_count = serializers.IntegerField(read_only=True)
 
+    count_annotations = {
+        'site_count': Count('sites'),
+    }
+
     class Meta:
         model = Region
         fields = ['id', 'name', 'slug', 'parent', 'site_count']
 
 
-class SiteSerializer(TaggitSerializer, CustomFieldModelSerializer):
+class SiteSerializer(TaggitSerializer, CountAnnotationMixin, CustomFieldModelSerializer):
     status = ChoiceField(choices=SITE_STATUS_CHOICES, required=False)
     region = NestedRegionSerializer(required=False, allow_null=True)
     tenant = NestedTenantSerializer(required=False, allow_null=True)
@@ -79,8 +116,18 @@ class SiteSerializer(TaggitSerializer, CustomFieldModelSerializer):
     virtualmachine_count = serializers.IntegerField(read_only=True)
     vlan_count = serializers.IntegerField(read_only=True)
 
+    count_annotations = {
+        'device_count': get_subquery(Device, 'site'),
+        'rack_count': get_subquery(Rack, 'site'),
+        'prefix_count': get_subquery(Prefix, 'site'),
+        'vlan_count': get_subquery(VLAN, 'site'),
+        'circuit_count': get_subquery(Circuit, 'terminations__site'),
+        'virtualmachine_count': get_subquery(VirtualMachine, 'cluster__site'),
+    }
+
     class Meta:
         model = Site
+        list_serializer_class = TaggedObjectListSerializer
         fields = [
             'id', 'name', 'slug', 'status', 'region', 'tenant', 'facility', 'asn', 'time_zone', 'description',
             'physical_address', 'shipping_address', 'latitude', 'longitude', 'contact_name', 'contact_phone',
@@ -93,24 +140,32 @@ class SiteSerializer(TaggitSerializer, CustomFieldModelSerializer):
 # Racks
 #
 
-class RackGroupSerializer(ValidatedModelSerializer):
+class RackGroupSerializer(CountAnnotationMixin, ValidatedModelSerializer):
     site = NestedSiteSerializer()
     rack_count = serializers.IntegerField(read_only=True)
 
+    count_annotations = {
+        'rack_count': Count('racks'),
+    }
+
     class Meta:
         model = RackGroup
         fields = ['id', 'name', 'slug', 'site', 'rack_count']
 
 
-class RackRoleSerializer(ValidatedModelSerializer):
+class RackRoleSerializer(CountAnnotationMixin, ValidatedModelSerializer):
     rack_count = serializers.IntegerField(read_only=True)
 
+    count_annotations = {
+        'rack_count': Count('racks'),
+    }
+
     class Meta:
         model = RackRole
         fields = ['id', 'name', 'slug', 'color', 'rack_count']
 
 
-class RackSerializer(TaggitSerializer, CustomFieldModelSerializer):
+class RackSerializer(TaggitSerializer, CountAnnotationMixin, CustomFieldModelSerializer):
     site = NestedSiteSerializer()
     group = NestedRackGroupSerializer(required=False, allow_null=True, default=None)
     tenant = NestedTenantSerializer(required=False, allow_null=True)
@@ -123,8 +178,14 @@ class RackSerializer(TaggitSerializer, CustomFieldModelSerializer):
     device_count = serializers.IntegerField(read_only=True)
     powerfeed_count = serializers.IntegerField(read_only=True)
 
+    count_annotations = {
+        'device_count': get_subquery(Device, 'rack'),
+        'powerfeed_count': get_subquery(PowerFeed, 'rack'),
+    }
+
     class Meta:
         model = Rack
+        list_serializer_class = TaggedObjectListSerializer
         fields = [
             'id', 'name', 'facility_id', 'display_name', 'site', 'group', 'tenant', 'status', 'role', 'serial',
             'asset_tag', 'type', 'width', 'u_height', 'desc_units', 'outer_width', 'outer_depth', 'outer_unit',
@@ -140,15 +201,45 @@ class RackSerializer(TaggitSerializer, CustomFieldModelSerializer):
 
         # Validate uniqueness of (group, facility_id) since we omitted the automatically-created validator from Meta.
         if data.get('facility_id', None):
-            validator = UniqueTogetherValidator(queryset=Rack.objects.all(), fields=('group', 'facility_id'))
-            validator.set_context(self)
-            validator(data)
+            self._facility_id_validator(data)
 
         # Enforce model validation
         super().validate(data)
 
         return data
 
+    @cached_property
+    def _facility_id_validator(self):
+        # Built once per serializer instance (and thus reused for each object in a bulk create). It is not shared at
+        # the class level because set_context() stores per-request state on the validator.
+        validator = UniqueTogetherValidator(queryset=Rack.objects.all(), fields=('group', 'facility_id'))
+        validator.set_context(self)
+        return validator
+
+
+class RackUnitListSerializer(serializers.ListSerializer):
+    """
+    Render a list of rack units directly from the dictionaries returned by Rack.get_rack_units(), bypassing the
+    per-field machinery of RackUnitSerializer. A device occupying multiple units is rendered only once.
+    """
+    def to_representation(self, data):
+        device_field = self.child.fields['device']
+        devices = {}
+        ret = []
+
+        for unit in data:
+            device = unit['device']
+            if device is not None and device.pk not in devices:
+                devices[device.pk] = device_field.to_representation(device)
+            ret.append(OrderedDict([
+                ('id', int(unit['id'])),
+                ('name', unit['name']),
+                ('face', int(unit['face'])),
+                ('device', devices[device.pk] if device is not None else None),
+            ]))
+
+        return ret
+
 
 class RackUnitSerializer(serializers.Serializer):
     """
@@ -159,6 +250,9 @@ class RackUnitSerializer(serializers.Serializer):
     face = serializers.IntegerField(read_only=True)
     device = NestedDeviceSerializer(read_only=True)
 
+    class Meta:
+        list_serializer_class = RackUnitListSerializer
+
 
 class RackReservationSerializer(ValidatedModelSerializer):
     rack = NestedRackSerializer()
@@ -174,24 +268,35 @@ class RackReservationSerializer(ValidatedModelSerializer):
 # Device types
 #
 
-class ManufacturerSerializer(ValidatedModelSerializer):
+class ManufacturerSerializer(CountAnnotationMixin, ValidatedModelSerializer):
     devicetype_count = serializers.IntegerField(read_only=True)
     inventoryitem_count = serializers.IntegerField(read_only=True)
     platform_count = serializers.IntegerField(read_only=True)
 
+    count_annotations = {
+        'devicetype_count': get_subquery(DeviceType, 'manufacturer'),
+        'inventoryitem_count': get_subquery(InventoryItem, 'manufacturer'),
+        'platform_count': get_subquery(Platform, 'manufacturer'),
+    }
+
     class Meta:
         model = Manufacturer
         fields = ['id', 'name', 'slug', 'devicetype_count', 'inventoryitem_count', 'platform_count']
 
 
-class DeviceTypeSerializer(TaggitSerializer, CustomFieldModelSerializer):
+class DeviceTypeSerializer(TaggitSerializer, CountAnnotationMixin, CustomFieldModelSerializer):
     manufacturer = NestedManufacturerSerializer()
     subdevice_role = ChoiceField(choices=SUBDEVICE_ROLE_CHOICES, required=False, allow_null=True)
     tags = TagListSerializerField(required=False)
     device_count = serializers.IntegerField(read_only=True)
 
+    count_annotations = {
+        'device_count': Count('instances'),
+    }
+
     class Meta:
         model = DeviceType
+        list_serializer_class = TaggedObjectListSerializer
         fields = [
             'id', 'manufacturer', 'model', 'slug', 'display_name', 'part_number', 'u_height', 'is_full_depth',
             'subdevice_role', 'comments', 'tags', 'custom_fields', 'created', 'last_updated', 'device_count',
@@ -280,20 +385,30 @@ class DeviceBayTemplateSerializer(ValidatedModelSerializer):
 # Devices
 #
 
-class DeviceRoleSerializer(ValidatedModelSerializer):
+class DeviceRoleSerializer(CountAnnotationMixin, ValidatedModelSerializer):
     device_count = serializers.IntegerField(read_only=True)
     virtualmachine_count = serializers.IntegerField(read_only=True)
 
+    count_annotations = {
+        'device_count': get_subquery(Device, 'device_role'),
+        'virtualmachine_count': get_subquery(VirtualMachine, 'role'),
+    }
+
     class Meta:
         model = DeviceRole
         fields = ['id', 'name', 'slug', 'color', 'vm_role', 'device_count', 'virtualmachine_count']
 
 
-class PlatformSerializer(ValidatedModelSerializer):
+class PlatformSerializer(CountAnnotationMixin, ValidatedModelSerializer):
     manufacturer = NestedManufacturerSerializer(required=False, allow_null=True)
     device_count = serializers.IntegerField(read_only=True)
     virtualmachine_count = serializers.IntegerField(read_only=True)
 
+    count_annotations = {
+        'device_count': get_subquery(Device, 'platform'),
+        'virtualmachine_count': get_subquery(VirtualMachine, 'platform'),
+    }
+
     class Meta:
         model = Platform
         fields = [
@@ -321,6 +436,7 @@ class DeviceSerializer(TaggitSerializer, CustomFieldModelSerializer):
 
     class Meta:
         model = Device
+        list_serializer_class = TaggedObjectListSerializer
         fields = [
             'id', 'name', 'display_name', 'device_type', 'device_role', 'tenant', 'platform', 'serial', 'asset_tag',
             'site', 'rack', 'position', 'face', 'parent_device', 'status', 'primary_ip', 'primary_ip4', 'primary_ip6',
@@ -333,22 +449,34 @@ class DeviceSerializer(TaggitSerializer, CustomFieldModelSerializer):
 
         # Validate uniqueness of (rack, position, face) since we omitted the automatically-created validator from Meta.
         if data.get('rack') and data.get('position') and data.get('face'):
-            validator = UniqueTogetherValidator(queryset=Device.objects.all(), fields=('rack', 'position', 'face'))
-            validator.set_context(self)
-            validator(data)
+            self._rack_position_validator(data)
 
         # Enforce model validation
         super().validate(data)
 
         return data
 
+    @cached_property
+    def _rack_position_validator(self):
+        # Built once per serializer instance; see RackSerializer._facility_id_validator
+        validator = UniqueTogetherValidator(queryset=Device.objects.all(), fields=('rack', 'position', 'face'))
+        validator.set_context(self)
+        return validator
+
     @swagger_serializer_method(serializer_or_field=NestedDeviceSerializer)
     def get_parent_device(self, obj):
-        try:
-            device_bay = obj.parent_bay
-        except DeviceBay.DoesNotExist:
+        # Read the parent bay from the select_related() cache where possible, since accessing a reverse one-to-one
+        # relation which does not exist raises an exception (the case for most devices)
+        if Device.parent_bay.is_cached(obj):
+            device_bay = Device.parent_bay.related.get_cached_value(obj)
+        else:
+            try:
+                device_bay = obj.parent_bay
+            except DeviceBay.DoesNotExist:
+                device_bay = None
+        if device_bay is None:
             return None
-        context = {'request': self.context['request']}
+        context = self._child_context
         data = NestedDeviceSerializer(instance=device_bay.device, context=context).data
         data['device_bay'] = NestedDeviceBaySerializer(instance=device_bay, context=context).data
         return data
@@ -377,6 +505,7 @@ class ConsoleServerPortSerializer(TaggitSerializer, ConnectedEndpointSerializer)
 
     class Meta:
         model = ConsoleServerPort
+        list_serializer_class = TaggedObjectListSerializer
         fields = [
             'id', 'device', 'name', 'description', 'connected_endpoint_type', 'connected_endpoint', 'connection_status',
             'cable', 'tags',
@@ -390,6 +519,7 @@ class ConsolePortSerializer(TaggitSerializer, ConnectedEndpointSerializer):
 
     class Meta:
         model = ConsolePort
+        list_serializer_class = TaggedObjectListSerializer
         fields = [
             'id', 'device', 'name', 'description', 'connected_endpoint_type', 'connected_endpoint', 'connection_status',
             'cable', 'tags',
@@ -415,6 +545,7 @@ class PowerOutletSerializer(TaggitSerializer, ConnectedEndpointSerializer):
 
     class Meta:
         model = PowerOutlet
+        list_serializer_class = TaggedObjectListSerializer
         fields = [
             'id', 'device', 'name', 'power_port', 'feed_leg', 'description', 'connected_endpoint_type',
             'connected_endpoint', 'connection_status', 'cable', 'tags',
@@ -428,6 +559,7 @@ class PowerPortSerializer(TaggitSerializer, ConnectedEndpointSerializer):
 
     class Meta:
         model = PowerPort
+        list_serializer_class = TaggedObjectListSerializer
         fields = [
             'id', 'device', 'name', 'maximum_draw', 'allocated_draw', 'description', 'connected_endpoint_type',
             'connected_endpoint', 'connection_status', 'cable', 'tags',
@@ -453,6 +585,7 @@ class InterfaceSerializer(TaggitSerializer, ConnectedEndpointSerializer):
 
     class Meta:
         model = Interface
+        list_serializer_class = TaggedObjectListSerializer
         fields = [
             'id', 'device', 'name', 'type', 'form_factor', 'enabled', 'lag', 'mtu', 'mac_address', 'mgmt_only',
             'description', 'connected_endpoint_type', 'connected_endpoint', 'connection_status', 'cable', 'mode',
@@ -463,15 +596,17 @@ class InterfaceSerializer(TaggitSerializer, ConnectedEndpointSerializer):
     def validate(self, data):
 
         # All associated VLANs be global or assigned to the parent device's site.
+        # Compare site IDs rather than Site instances to avoid fetching the site of each VLAN.
         device = self.instance.device if self.instance else data.get('device')
+        valid_site_ids = (device.site_id, None)
         untagged_vlan = data.get('untagged_vlan')
-        if untagged_vlan and untagged_vlan.site not in [device.site, None]:
+        if untagged_vlan and untagged_vlan.site_id not in valid_site_ids:
             raise serializers.ValidationError({
                 'untagged_vlan': "VLAN {} must belong to the same site as the interface's parent device, or it must be "
                                  "global.".format(untagged_vlan)
             })
         for vlan in data.get('tagged_vlans', []):
-            if vlan.site not in [device.site, None]:
+            if vlan.site_id not in valid_site_ids:
                 raise serializers.ValidationError({
                     'tagged_vlans': "VLAN {} must belong to the same site as the interface's parent device, or it must "
                                     "be global.".format(vlan)
@@ -488,6 +623,7 @@ class RearPortSerializer(ValidatedModelSerializer):
 
     class Meta:
         model = RearPort
+        list_serializer_class = TaggedObjectListSerializer
         fields = ['id', 'device', 'name', 'type', 'positions', 'description', 'cable', 'tags']
 
 
@@ -511,6 +647,7 @@ class FrontPortSerializer(ValidatedModelSerializer):
 
     class Meta:
         model = FrontPort
+        list_serializer_class = TaggedObjectListSerializer
         fields = ['id', 'device', 'name', 'type', 'rear_port', 'rear_port_position', 'description', 'cable', 'tags']
 
 
@@ -521,6 +658,7 @@ class DeviceBaySerializer(TaggitSerializer, ValidatedModelSerializer):
 
     class Meta:
         model = DeviceBay
+        list_serializer_class = TaggedObjectListSerializer
         fields = ['id', 'device', 'name', 'description', 'installed_device', 'tags']
 
 
@@ -537,6 +675,7 @@ class InventoryItemSerializer(TaggitSerializer, ValidatedModelSerializer):
 
     class Meta:
         model = InventoryItem
+        list_serializer_class = TaggedObjectListSerializer
         fields = [
             'id', 'device', 'parent', 'name', 'manufacturer', 'part_id', 'serial', 'asset_tag', 'discovered',
             'description', 'tags',
@@ -566,28 +705,25 @@ class CableSerializer(ValidatedModelSerializer):
             'termination_b', 'type', 'status', 'label', 'color', 'length', 'length_unit',
         ]
 
-    def _get_termination(self, obj, side):
+    def _serialize_termination(self, termination):
         """
         Serialize a nested representation of a termination.
         """
-        if side.lower() not in ['a', 'b']:
-            raise ValueError("Termination side must be either A or B.")
-        termination = getattr(obj, 'termination_{}'.format(side.lower()))
         if termination is None:
             return None
         serializer = get_serializer_for_model(termination, prefix='Nested')
-        context = {'request': self.context['request']}
+        context = self._child_context
         data = serializer(termination, context=context).data
 
         return data
 
     @swagger_serializer_method(serializer_or_field=serializers.DictField)
     def get_termination_a(self, obj):
-        return self._get_termination(obj, 'a')
+        return self._serialize_termination(obj.termination_a)
 
     @swagger_serializer_method(serializer_or_field=serializers.DictField)
     def get_termination_b(self, obj):
-        return self._get_termination(obj, 'b')
+        return self._serialize_termination(obj.termination_b)
 
 
 class TracedCableSerializer(serializers.ModelSerializer):
@@ -618,7 +754,7 @@ class InterfaceConnectionSerializer(ValidatedModelSerializer):
 
     @swagger_serializer_method(serializer_or_field=NestedInterfaceSerializer)
     def get_interface_a(self, obj):
-        context = {'request': self.context['request']}
+        context = self._child_context
         return NestedInterfaceSerializer(instance=obj, context=context).data
 
 
@@ -626,13 +762,18 @@ class InterfaceConnectionSerializer(ValidatedModelSerializer):
 # Virtual chassis
 #
 
-class VirtualChassisSerializer(TaggitSerializer, ValidatedModelSerializer):
+class VirtualChassisSerializer(TaggitSerializer, CountAnnotationMixin, ValidatedModelSerializer):
     master = NestedDeviceSerializer()
     tags = TagListSerializerField(required=False)
     member_count = serializers.IntegerField(read_only=True)
 
+    count_annotations = {
+        'member_count': Count('members'),
+    }
+
     class Meta:
         model = VirtualChassis
+        list_serializer_class = TaggedObjectListSerializer
         fields = ['id', 'master', 'domain', 'tags', 'member_count']
 
 
@@ -640,7 +781,7 @@ class VirtualChassisSerializer(TaggitSerializer, ValidatedModelSerializer):
 # Power panels
 #
 
-class PowerPanelSerializer(ValidatedModelSerializer):
+class PowerPanelSerializer(CountAnnotationMixin, ValidatedModelSerializer):
     site = NestedSiteSerializer()
     rack_group = NestedRackGroupSerializer(
         required=False,
@@ -649,6 +790,10 @@ class PowerPanelSerializer(ValidatedModelSerializer):
     )
     powerfeed_count = serializers.IntegerField(read_only=True)
 
+    count_annotations = {
+        'powerfeed_count': Count('powerfeeds'),
+    }
+
     class Meta:
         model = PowerPanel
         fields = ['id', 'site', 'rack_group', 'name', 'powerfeed_count']
@@ -683,6 +828,7 @@ class PowerFeedSerializer(TaggitSerializer, CustomFieldModelSerializer):
 
     class Meta:
         model = PowerFeed
+        list_serializer_class = TaggedObjectListSerializer
         fields = [
             'id', 'power_panel', 'rack', 'name', 'status', 'type', 'supply', 'phase', 'voltage', 'amperage',
             'max_utilization', 'comments', 'tags', 'custom_fields', 'created', 'last_updated',
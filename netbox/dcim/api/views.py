@@ -1,7 +1,7 @@
 from collections import OrderedDict
 
 from django.conf import settings
-from django.db.models import Count, F
+from django.db.models import F
 from django.http import HttpResponseForbidden
 from django.shortcuts import get_object_or_404
 from drf_yasg import openapi
@@ -12,7 +12,6 @@ from rest_framework.mixins import ListModelMixin
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet, ViewSet
 
-from circuits.models import Circuit
 from dcim import filters
 from dcim.models import (
     Cable, ConsolePort, ConsolePortTemplate, ConsoleServerPort, ConsoleServerPortTemplate, Device, DeviceBay,
@@ -24,12 +23,10 @@ from dcim.models import (
 from extras.api.serializers import RenderedGraphSerializer
 from extras.api.views import CustomFieldModelViewSet
 from extras.models import Graph, GRAPH_TYPE_INTERFACE, GRAPH_TYPE_SITE
-from ipam.models import Prefix, VLAN
 from utilities.api import (
-    get_serializer_for_model, IsAuthenticatedOrLoginNotRequired, FieldChoicesViewSet, ModelViewSet, ServiceUnavailable,
+    AutoPrefetchMixin, get_serializer_for_model, IsAuthenticatedOrLoginNotRequired, FieldChoicesViewSet, ModelViewSet,
+    ServiceUnavailable,
 )
-from utilities.utils import get_subquery
-from virtualization.models import VirtualMachine
 from . import serializers
 from .exceptions import MissingFilterException
 
@@ -97,9 +94,7 @@ class CableTraceMixin(object):
 #
 
 class RegionViewSet(ModelViewSet):
-    queryset = Region.objects.annotate(
-        site_count=Count('sites')
-    )
+    queryset = Region.objects.all()
     serializer_class = serializers.RegionSerializer
     filterset_class = filters.RegionFilter
 
@@ -113,13 +108,6 @@ class SiteViewSet(CustomFieldModelViewSet):
         'region', 'tenant'
     ).prefetch_related(
         'tags'
-    ).annotate(
-        device_count=get_subquery(Device, 'site'),
-        rack_count=get_subquery(Rack, 'site'),
-        prefix_count=get_subquery(Prefix, 'site'),
-        vlan_count=get_subquery(VLAN, 'site'),
-        circuit_count=get_subquery(Circuit, 'terminations__site'),
-        virtualmachine_count=get_subquery(VirtualMachine, 'cluster__site'),
     )
     serializer_class = serializers.SiteSerializer
     filterset_class = filters.SiteFilter
@@ -140,9 +128,7 @@ class SiteViewSet(CustomFieldModelViewSet):
 #
 
 class RackGroupViewSet(ModelViewSet):
-    queryset = RackGroup.objects.select_related('site').annotate(
-        rack_count=Count('racks')
-    )
+    queryset = RackGroup.objects.select_related('site')
     serializer_class = serializers.RackGroupSerializer
     filterset_class = filters.RackGroupFilter
 
@@ -152,9 +138,7 @@ class RackGroupViewSet(ModelViewSet):
 #
 
 class RackRoleViewSet(ModelViewSet):
-    queryset = RackRole.objects.annotate(
-        rack_count=Count('racks')
-    )
+    queryset = RackRole.objects.all()
     serializer_class = serializers.RackRoleSerializer
     filterset_class = filters.RackRoleFilter
 
@@ -163,14 +147,11 @@ class RackRoleViewSet(ModelViewSet):
 # Racks
 #
 
-class RackViewSet(CustomFieldModelViewSet):
+class RackViewSet(AutoPrefetchMixin, CustomFieldModelViewSet):
     queryset = Rack.objects.select_related(
         'site', 'group__site', 'role', 'tenant'
     ).prefetch_related(
         'tags'
-    ).annotate(
-        device_count=get_subquery(Device, 'rack'),
-        powerfeed_count=get_subquery(PowerFeed, 'rack')
     )
     serializer_class = serializers.RackSerializer
     filterset_class = filters.RackFilter
@@ -220,11 +201,7 @@ class RackReservationViewSet(ModelViewSet):
 #
 
 class ManufacturerViewSet(ModelViewSet):
-    queryset = Manufacturer.objects.annotate(
-        devicetype_count=get_subquery(DeviceType, 'manufacturer'),
-        inventoryitem_count=get_subquery(InventoryItem, 'manufacturer'),
-        platform_count=get_subquery(Platform, 'manufacturer')
-    )
+    queryset = Manufacturer.objects.all()
     serializer_class = serializers.ManufacturerSerializer
     filterset_class = filters.ManufacturerFilter
 
@@ -234,9 +211,7 @@ class ManufacturerViewSet(ModelViewSet):
 #
 
 class DeviceTypeViewSet(CustomFieldModelViewSet):
-    queryset = DeviceType.objects.select_related('manufacturer').prefetch_related('tags').annotate(
-        device_count=Count('instances')
-    )
+    queryset = DeviceType.objects.select_related('manufacturer').prefetch_related('tags')
     serializer_class = serializers.DeviceTypeSerializer
     filterset_class = filters.DeviceTypeFilter
 
@@ -298,10 +273,7 @@ class DeviceBayTemplateViewSet(ModelViewSet):
 #
 
 class DeviceRoleViewSet(ModelViewSet):
-    queryset = DeviceRole.objects.annotate(
-        device_count=get_subquery(Device, 'device_role'),
-        virtualmachine_count=get_subquery(VirtualMachine, 'role')
-    )
+    queryset = DeviceRole.objects.all()
     serializer_class = serializers.DeviceRoleSerializer
     filterset_class = filters.DeviceRoleFilter
 
@@ -311,10 +283,7 @@ class DeviceRoleViewSet(ModelViewSet):
 #
 
 class PlatformViewSet(ModelViewSet):
-    queryset = Platform.objects.annotate(
-        device_count=get_subquery(Device, 'platform'),
-        virtualmachine_count=get_subquery(VirtualMachine, 'platform')
-    )
+    queryset = Platform.objects.all()
     serializer_class = serializers.PlatformSerializer
     filterset_class = filters.PlatformFilter
 
@@ -323,7 +292,7 @@ class PlatformViewSet(ModelViewSet):
 # Devices
 #
 
-class DeviceViewSet(CustomFieldModelViewSet):
+class DeviceViewSet(AutoPrefetchMixin, CustomFieldModelViewSet):
     queryset = Device.objects.select_related(
         'device_type__manufacturer', 'device_role', 'tenant', 'platform', 'site', 'rack', 'parent_bay',
         'virtual_chassis__master',
@@ -468,11 +437,11 @@ class PowerOutletViewSet(CableTraceMixin, ModelViewSet):
     filterset_class = filters.PowerOutletFilter
 
 
-class InterfaceViewSet(CableTraceMixin, ModelViewSet):
+class InterfaceViewSet(CableTraceMixin, AutoPrefetchMixin, ModelViewSet):
     queryset = Interface.objects.filter(
         device__isnull=False
     ).select_related(
-        'device', '_connected_interface', '_connected_circuittermination', 'cable'
+        'device', '_connected_interface__device', '_connected_circuittermination__circuit', 'cable'
     ).prefetch_related(
         'ip_addresses', 'tags'
     )
@@ -538,7 +507,7 @@ class ConsoleConnectionViewSet(ListModelMixin, GenericViewSet):
 
 class PowerConnectionViewSet(ListModelMixin, GenericViewSet):
     queryset = PowerPort.objects.select_related(
-        'device', 'connected_endpoint__device'
+        'device', '_connected_poweroutlet__device'
     ).filter(
         _connected_poweroutlet__isnull=False
     )
@@ -575,9 +544,7 @@ class CableViewSet(ModelViewSet):
 #
 
 class VirtualChassisViewSet(ModelViewSet):
-    queryset = VirtualChassis.objects.prefetch_related('tags').annotate(
-        member_count=Count('members')
-    )
+    queryset = VirtualChassis.objects.prefetch_related('tags')
     serializer_class = serializers.VirtualChassisSerializer
     filterset_class = filters.VirtualChassisFilter
 
@@ -589,8 +556,6 @@ class VirtualChassisViewSet(ModelViewSet):
 class PowerPanelViewSet(ModelViewSet):
     queryset = PowerPanel.objects.select_related(
         'site', 'rack_group'
-    ).annotate(
-        powerfeed_count=Count('powerfeeds')
     )
     serializer_class = serializers.PowerPanelSerializer
     filterset_class = filters.PowerPanelFilter
@@ -253,20 +253,21 @@ IFACE_TYPE_CHOICES = [
     ],
 ]
 
-VIRTUAL_IFACE_TYPES = [
+# Interface type groups are frozensets, since they are used chiefly for membership tests
+VIRTUAL_IFACE_TYPES = frozenset([
     IFACE_TYPE_VIRTUAL,
     IFACE_TYPE_LAG,
-]
+])
 
-WIRELESS_IFACE_TYPES = [
+WIRELESS_IFACE_TYPES = frozenset([
     IFACE_TYPE_80211A,
     IFACE_TYPE_80211G,
     IFACE_TYPE_80211N,
     IFACE_TYPE_80211AC,
     IFACE_TYPE_80211AD,
-]
+])
 
-NONCONNECTABLE_IFACE_TYPES = VIRTUAL_IFACE_TYPES + WIRELESS_IFACE_TYPES
+NONCONNECTABLE_IFACE_TYPES = VIRTUAL_IFACE_TYPES | WIRELESS_IFACE_TYPES
 
 IFACE_MODE_ACCESS = 100
 IFACE_MODE_TAGGED = 200
@@ -1,6 +1,5 @@
 import django_filters
 from django.contrib.auth.models import User
-from django.core.exceptions import ObjectDoesNotExist
 from django.db.models import Q
 
 from extras.filters import CustomFieldFilterSet
@@ -8,8 +7,8 @@ from tenancy.filtersets import TenancyFilterSet
 from tenancy.models import Tenant
 from utilities.constants import COLOR_CHOICES
 from utilities.filters import (
-    MultiValueMACAddressFilter, MultiValueNumberFilter, NameSlugSearchFilterSet, NumericInFilter, TagFilter,
-    TreeNodeMultipleChoiceFilter,
+    BaseFilterSet, MultiValueMACAddressFilter, MultiValueNumberFilter, NameSlugSearchFilterSet, NumericInFilter,
+    TagFilter, TreeNodeMultipleChoiceFilter,
 )
 from virtualization.models import Cluster
 from .constants import *
@@ -18,18 +17,40 @@ from .models import (
     DeviceBayTemplate, DeviceRole, DeviceType, FrontPort, FrontPortTemplate, Interface, InterfaceTemplate,
     InventoryItem, Manufacturer, Platform, PowerFeed, PowerOutlet, PowerOutletTemplate, PowerPanel, PowerPort,
     PowerPortTemplate, Rack, RackGroup, RackReservation, RackRole, RearPort, RearPortTemplate, Region, Site,
-    VirtualChassis,
+    VirtualChassis, get_device_cables_filter,
 )
 
 
+def _filter_has_components(queryset, value, field_name, *component_models):
+    """
+    Return the objects in the queryset which have (if value is True) or lack (if value is False) at least one instance
+    of any of the given component models. Each model is tested with an IN subquery on the component's foreign key
+    (field_name) rather than by joining the component table.
+    """
+    q = Q()
+    for model in component_models:
+        q |= Q(pk__in=model.objects.filter(**{'{}__isnull'.format(field_name): False}).values(field_name))
+    return queryset.filter(q) if value else queryset.exclude(q)
+
+
+def _icontains_any(fields, value):
+    """
+    Return a Q object matching objects for which any of the given fields contains the value (case-insensitive).
+    """
+    q = Q()
+    for field in fields:
+        q |= Q(**{'{}__icontains'.format(field): value})
+    return q
+
+
 class RegionFilter(NameSlugSearchFilterSet):
     parent_id = django_filters.ModelMultipleChoiceFilter(
-        queryset=Region.objects.all(),
+        queryset=Region.objects.only('pk'),
         label='Parent region (ID)',
     )
     parent = django_filters.ModelMultipleChoiceFilter(
         field_name='parent__slug',
-        queryset=Region.objects.all(),
+        queryset=Region.objects.only('pk', 'slug'),
         to_field_name='slug',
         label='Parent region (slug)',
     )
@@ -65,6 +86,11 @@ class SiteFilter(TenancyFilterSet, CustomFieldFilterSet):
     )
     tag = TagFilter()
 
+    search_fields = (
+        'name', 'facility', 'description', 'physical_address', 'shipping_address', 'contact_name', 'contact_phone',
+        'contact_email', 'comments',
+    )
+
     class Meta:
         model = Site
         fields = [
@@ -73,34 +99,23 @@ class SiteFilter(TenancyFilterSet, CustomFieldFilterSet):
         ]
 
     def search(self, queryset, name, value):
-        if not value.strip():
+        value = value.strip()
+        if not value:
             return queryset
-        qs_filter = (
-            Q(name__icontains=value) |
-            Q(facility__icontains=value) |
-            Q(description__icontains=value) |
-            Q(physical_address__icontains=value) |
-            Q(shipping_address__icontains=value) |
-            Q(contact_name__icontains=value) |
-            Q(contact_phone__icontains=value) |
-            Q(contact_email__icontains=value) |
-            Q(comments__icontains=value)
-        )
-        try:
-            qs_filter |= Q(asn=int(value.strip()))
-        except ValueError:
-            pass
+        qs_filter = _icontains_any(self.search_fields, value)
+        if value.isdecimal():
+            qs_filter |= Q(asn=int(value))
         return queryset.filter(qs_filter)
 
 
 class RackGroupFilter(NameSlugSearchFilterSet):
     site_id = django_filters.ModelMultipleChoiceFilter(
-        queryset=Site.objects.all(),
+        queryset=Site.objects.only('pk'),
         label='Site (ID)',
     )
     site = django_filters.ModelMultipleChoiceFilter(
         field_name='site__slug',
-        queryset=Site.objects.all(),
+        queryset=Site.objects.only('pk', 'slug'),
         to_field_name='slug',
         label='Site (slug)',
     )
@@ -127,22 +142,22 @@ class RackFilter(TenancyFilterSet, CustomFieldFilterSet):
         label='Search',
     )
     site_id = django_filters.ModelMultipleChoiceFilter(
-        queryset=Site.objects.all(),
+        queryset=Site.objects.only('pk'),
         label='Site (ID)',
     )
     site = django_filters.ModelMultipleChoiceFilter(
         field_name='site__slug',
-        queryset=Site.objects.all(),
+        queryset=Site.objects.only('pk', 'slug'),
         to_field_name='slug',
         label='Site (slug)',
     )
     group_id = django_filters.ModelMultipleChoiceFilter(
-        queryset=RackGroup.objects.all(),
+        queryset=RackGroup.objects.only('pk'),
         label='Group (ID)',
     )
     group = django_filters.ModelMultipleChoiceFilter(
         field_name='group__slug',
-        queryset=RackGroup.objects.all(),
+        queryset=RackGroup.objects.only('pk', 'slug'),
         to_field_name='slug',
         label='Group',
     )
@@ -151,17 +166,19 @@ class RackFilter(TenancyFilterSet, CustomFieldFilterSet):
         null_value=None
     )
     role_id = django_filters.ModelMultipleChoiceFilter(
-        queryset=RackRole.objects.all(),
+        queryset=RackRole.objects.only('pk'),
         label='Role (ID)',
     )
     role = django_filters.ModelMultipleChoiceFilter(
         field_name='role__slug',
-        queryset=RackRole.objects.all(),
+        queryset=RackRole.objects.only('pk', 'slug'),
         to_field_name='slug',
         label='Role (slug)',
     )
     tag = TagFilter()
 
+    search_fields = ('name', 'facility_id', 'serial', 'asset_tag', 'comments')
+
     class Meta:
         model = Rack
         fields = [
@@ -170,15 +187,10 @@ class RackFilter(TenancyFilterSet, CustomFieldFilterSet):
         ]
 
     def search(self, queryset, name, value):
-        if not value.strip():
+        value = value.strip()
+        if not value:
             return queryset
-        return queryset.filter(
-            Q(name__icontains=value) |
-            Q(facility_id__icontains=value) |
-            Q(serial__icontains=value.strip()) |
-            Q(asset_tag__icontains=value.strip()) |
-            Q(comments__icontains=value)
-        )
+        return queryset.filter(_icontains_any(self.search_fields, value))
 
 
 class RackReservationFilter(TenancyFilterSet):
@@ -191,55 +203,53 @@ class RackReservationFilter(TenancyFilterSet):
         label='Search',
     )
     rack_id = django_filters.ModelMultipleChoiceFilter(
-        queryset=Rack.objects.all(),
+        queryset=Rack.objects.only('pk'),
         label='Rack (ID)',
     )
     site_id = django_filters.ModelMultipleChoiceFilter(
         field_name='rack__site',
-        queryset=Site.objects.all(),
+        queryset=Site.objects.only('pk'),
         label='Site (ID)',
     )
     site = django_filters.ModelMultipleChoiceFilter(
         field_name='rack__site__slug',
-        queryset=Site.objects.all(),
+        queryset=Site.objects.only('pk', 'slug'),
         to_field_name='slug',
         label='Site (slug)',
     )
     group_id = django_filters.ModelMultipleChoiceFilter(
         field_name='rack__group',
-        queryset=RackGroup.objects.all(),
+        queryset=RackGroup.objects.only('pk'),
         label='Group (ID)',
     )
     group = django_filters.ModelMultipleChoiceFilter(
         field_name='rack__group__slug',
-        queryset=RackGroup.objects.all(),
+        queryset=RackGroup.objects.only('pk', 'slug'),
         to_field_name='slug',
         label='Group',
     )
     user_id = django_filters.ModelMultipleChoiceFilter(
-        queryset=User.objects.all(),
+        queryset=User.objects.only('pk'),
         label='User (ID)',
     )
     user = django_filters.ModelMultipleChoiceFilter(
         field_name='user',
-        queryset=User.objects.all(),
+        queryset=User.objects.only('pk', 'username'),
         to_field_name='username',
         label='User (name)',
     )
 
+    search_fields = ('rack__name', 'rack__facility_id', 'user__username', 'description')
+
     class Meta:
         model = RackReservation
         fields = ['created']
 
     def search(self, queryset, name, value):
-        if not value.strip():
+        value = value.strip()
+        if not value:
             return queryset
-        return queryset.filter(
-            Q(rack__name__icontains=value) |
-            Q(rack__facility_id__icontains=value) |
-            Q(user__username__icontains=value) |
-            Q(description__icontains=value)
-        )
+        return queryset.filter(_icontains_any(self.search_fields, value))
 
 
 class ManufacturerFilter(NameSlugSearchFilterSet):
@@ -259,12 +269,12 @@ class DeviceTypeFilter(CustomFieldFilterSet):
         label='Search',
     )
     manufacturer_id = django_filters.ModelMultipleChoiceFilter(
-        queryset=Manufacturer.objects.all(),
+        queryset=Manufacturer.objects.only('pk'),
         label='Manufacturer (ID)',
     )
     manufacturer = django_filters.ModelMultipleChoiceFilter(
         field_name='manufacturer__slug',
-        queryset=Manufacturer.objects.all(),
+        queryset=Manufacturer.objects.only('pk', 'slug'),
         to_field_name='slug',
         label='Manufacturer (slug)',
     )
@@ -294,6 +304,8 @@ class DeviceTypeFilter(CustomFieldFilterSet):
     )
     tag = TagFilter()
 
+    search_fields = ('manufacturer__name', 'model', 'part_number', 'comments')
+
     class Meta:
         model = DeviceType
         fields = [
@@ -301,40 +313,33 @@ class DeviceTypeFilter(CustomFieldFilterSet):
         ]
 
     def search(self, queryset, name, value):
-        if not value.strip():
+        value = value.strip()
+        if not value:
             return queryset
-        return queryset.filter(
-            Q(manufacturer__name__icontains=value) |
-            Q(model__icontains=value) |
-            Q(part_number__icontains=value) |
-            Q(comments__icontains=value)
-        )
+        return queryset.filter(_icontains_any(self.search_fields, value))
 
     def _console_ports(self, queryset, name, value):
-        return queryset.exclude(consoleport_templates__isnull=value)
+        return _filter_has_components(queryset, value, 'device_type', ConsolePortTemplate)
 
     def _console_server_ports(self, queryset, name, value):
-        return queryset.exclude(consoleserverport_templates__isnull=value)
+        return _filter_has_components(queryset, value, 'device_type', ConsoleServerPortTemplate)
 
     def _power_ports(self, queryset, name, value):
-        return queryset.exclude(powerport_templates__isnull=value)
+        return _filter_has_components(queryset, value, 'device_type', PowerPortTemplate)
 
     def _power_outlets(self, queryset, name, value):
-        return queryset.exclude(poweroutlet_templates__isnull=value)
+        return _filter_has_components(queryset, value, 'device_type', PowerOutletTemplate)
 
     def _interfaces(self, queryset, name, value):
-        return queryset.exclude(interface_templates__isnull=value)
+        return _filter_has_components(queryset, value, 'device_type', InterfaceTemplate)
 
     def _pass_through_ports(self, queryset, name, value):
-        return queryset.exclude(
-            frontport_templates__isnull=value,
-            rearport_templates__isnull=value
-        )
+        return _filter_has_components(queryset, value, 'device_type', FrontPortTemplate, RearPortTemplate)
 
 
 class DeviceTypeComponentFilterSet(NameSlugSearchFilterSet):
     devicetype_id = django_filters.ModelMultipleChoiceFilter(
-        queryset=DeviceType.objects.all(),
+        queryset=DeviceType.objects.only('pk'),
         field_name='device_type_id',
         label='Device type (ID)',
     )
@@ -406,12 +411,12 @@ class DeviceRoleFilter(NameSlugSearchFilterSet):
 class PlatformFilter(NameSlugSearchFilterSet):
     manufacturer_id = django_filters.ModelMultipleChoiceFilter(
         field_name='manufacturer',
-        queryset=Manufacturer.objects.all(),
+        queryset=Manufacturer.objects.only('pk'),
         label='Manufacturer (ID)',
     )
     manufacturer = django_filters.ModelMultipleChoiceFilter(
         field_name='manufacturer__slug',
-        queryset=Manufacturer.objects.all(),
+        queryset=Manufacturer.objects.only('pk', 'slug'),
         to_field_name='slug',
         label='Manufacturer (slug)',
     )
@@ -432,37 +437,37 @@ class DeviceFilter(TenancyFilterSet, CustomFieldFilterSet):
     )
     manufacturer_id = django_filters.ModelMultipleChoiceFilter(
         field_name='device_type__manufacturer',
-        queryset=Manufacturer.objects.all(),
+        queryset=Manufacturer.objects.only('pk'),
         label='Manufacturer (ID)',
     )
     manufacturer = django_filters.ModelMultipleChoiceFilter(
         field_name='device_type__manufacturer__slug',
-        queryset=Manufacturer.objects.all(),
+        queryset=Manufacturer.objects.only('pk', 'slug'),
         to_field_name='slug',
         label='Manufacturer (slug)',
     )
     device_type_id = django_filters.ModelMultipleChoiceFilter(
-        queryset=DeviceType.objects.all(),
+        queryset=DeviceType.objects.only('pk'),
         label='Device type (ID)',
     )
     role_id = django_filters.ModelMultipleChoiceFilter(
         field_name='device_role_id',
-        queryset=DeviceRole.objects.all(),
+        queryset=DeviceRole.objects.only('pk'),
         label='Role (ID)',
     )
     role = django_filters.ModelMultipleChoiceFilter(
         field_name='device_role__slug',
-        queryset=DeviceRole.objects.all(),
+        queryset=DeviceRole.objects.only('pk', 'slug'),
         to_field_name='slug',
         label='Role (slug)',
     )
     platform_id = django_filters.ModelMultipleChoiceFilter(
-        queryset=Platform.objects.all(),
+        queryset=Platform.objects.only('pk'),
         label='Platform (ID)',
     )
     platform = django_filters.ModelMultipleChoiceFilter(
         field_name='platform__slug',
-        queryset=Platform.objects.all(),
+        queryset=Platform.objects.only('pk', 'slug'),
         to_field_name='slug',
         label='Platform (slug)',
     )
@@ -478,32 +483,32 @@ class DeviceFilter(TenancyFilterSet, CustomFieldFilterSet):
         label='Region (slug)',
     )
     site_id = django_filters.ModelMultipleChoiceFilter(
-        queryset=Site.objects.all(),
+        queryset=Site.objects.only('pk'),
         label='Site (ID)',
     )
     site = django_filters.ModelMultipleChoiceFilter(
         field_name='site__slug',
-        queryset=Site.objects.all(),
+        queryset=Site.objects.only('pk', 'slug'),
         to_field_name='slug',
         label='Site name (slug)',
     )
     rack_group_id = django_filters.ModelMultipleChoiceFilter(
         field_name='rack__group',
-        queryset=RackGroup.objects.all(),
+        queryset=RackGroup.objects.only('pk'),
         label='Rack group (ID)',
     )
     rack_id = django_filters.ModelMultipleChoiceFilter(
         field_name='rack',
-        queryset=Rack.objects.all(),
+        queryset=Rack.objects.only('pk'),
         label='Rack (ID)',
     )
     cluster_id = django_filters.ModelMultipleChoiceFilter(
-        queryset=Cluster.objects.all(),
+        queryset=Cluster.objects.only('pk'),
         label='VM cluster (ID)',
     )
     model = django_filters.ModelMultipleChoiceFilter(
         field_name='device_type__slug',
-        queryset=DeviceType.objects.all(),
+        queryset=DeviceType.objects.only('pk', 'slug'),
         to_field_name='slug',
         label='Device model (slug)',
     )
@@ -525,7 +530,7 @@ class DeviceFilter(TenancyFilterSet, CustomFieldFilterSet):
     )
     virtual_chassis_id = django_filters.ModelMultipleChoiceFilter(
         field_name='virtual_chassis',
-        queryset=VirtualChassis.objects.all(),
+        queryset=VirtualChassis.objects.only('pk'),
         label='Virtual chassis (ID)',
     )
     virtual_chassis_member = django_filters.BooleanFilter(
@@ -558,20 +563,20 @@ class DeviceFilter(TenancyFilterSet, CustomFieldFilterSet):
     )
     tag = TagFilter()
 
+    search_fields = ('name', 'serial', 'asset_tag', 'comments')
+
     class Meta:
         model = Device
         fields = ['id', 'name', 'serial', 'asset_tag', 'face', 'position', 'vc_position', 'vc_priority']
 
     def search(self, queryset, name, value):
-        if not value.strip():
+        value = value.strip()
+        if not value:
             return queryset
         return queryset.filter(
-            Q(name__icontains=value) |
-            Q(serial__icontains=value.strip()) |
-            Q(inventory_items__serial__icontains=value.strip()) |
-            Q(asset_tag__icontains=value.strip()) |
-            Q(comments__icontains=value)
-        ).distinct()
+            _icontains_any(self.search_fields, value) |
+            Q(pk__in=InventoryItem.objects.filter(serial__icontains=value).values('device'))
+        )
 
     def _has_primary_ip(self, queryset, name, value):
         if value:
@@ -589,50 +594,47 @@ class DeviceFilter(TenancyFilterSet, CustomFieldFilterSet):
         return queryset.exclude(virtual_chassis__isnull=value)
 
     def _console_ports(self, queryset, name, value):
-        return queryset.exclude(consoleports__isnull=value)
+        return _filter_has_components(queryset, value, 'device', ConsolePort)
 
     def _console_server_ports(self, queryset, name, value):
-        return queryset.exclude(consoleserverports__isnull=value)
+        return _filter_has_components(queryset, value, 'device', ConsoleServerPort)
 
     def _power_ports(self, queryset, name, value):
-        return queryset.exclude(powerports__isnull=value)
+        return _filter_has_components(queryset, value, 'device', PowerPort)
 
     def _power_outlets(self, queryset, name, value):
-        return queryset.exclude(poweroutlets__isnull=value)
+        return _filter_has_components(queryset, value, 'device', PowerOutlet)
 
     def _interfaces(self, queryset, name, value):
-        return queryset.exclude(interfaces__isnull=value)
+        return _filter_has_components(queryset, value, 'device', Interface)
 
     def _pass_through_ports(self, queryset, name, value):
-        return queryset.exclude(
-            frontports__isnull=value,
-            rearports__isnull=value
-        )
+        return _filter_has_components(queryset, value, 'device', FrontPort, RearPort)
 
 
-class DeviceComponentFilterSet(django_filters.FilterSet):
+class DeviceComponentFilterSet(BaseFilterSet):
     q = django_filters.CharFilter(
         method='search',
         label='Search',
     )
     device_id = django_filters.ModelMultipleChoiceFilter(
-        queryset=Device.objects.all(),
+        queryset=Device.objects.only('pk'),
         label='Device (ID)',
     )
     device = django_filters.ModelChoiceFilter(
-        queryset=Device.objects.all(),
+        queryset=Device.objects.only('pk', 'name'),
         to_field_name='name',
         label='Device (name)',
     )
     tag = TagFilter()
 
+    search_fields = ('name', 'description')
+
     def search(self, queryset, name, value):
-        if not value.strip():
+        value = value.strip()
+        if not value:
             return queryset
-        return queryset.filter(
-            Q(name__icontains=value) |
-            Q(description__icontains=value)
-        )
+        return queryset.filter(_icontains_any(self.search_fields, value))
 
 
 class ConsolePortFilter(DeviceComponentFilterSet):
@@ -683,7 +685,15 @@ class PowerOutletFilter(DeviceComponentFilterSet):
         fields = ['id', 'name', 'feed_leg', 'description', 'connection_status']
 
 
-class InterfaceFilter(django_filters.FilterSet):
+# Conditions matching each kind of interface, for InterfaceFilter.filter_kind()
+INTERFACE_KIND_QUERIES = {
+    'physical': ~Q(type__in=NONCONNECTABLE_IFACE_TYPES),
+    'virtual': Q(type__in=VIRTUAL_IFACE_TYPES),
+    'wireless': Q(type__in=WIRELESS_IFACE_TYPES),
+}
+
+
+class InterfaceFilter(BaseFilterSet):
     """
     Not using DeviceComponentFilterSet for Interfaces because we need to check for VirtualChassis membership.
     """
@@ -712,7 +722,7 @@ class InterfaceFilter(django_filters.FilterSet):
     )
     lag_id = django_filters.ModelMultipleChoiceFilter(
         field_name='lag',
-        queryset=Interface.objects.all(),
+        queryset=Interface.objects.only('pk'),
         label='LAG interface (ID)',
     )
     mac_address = MultiValueMACAddressFilter()
@@ -730,62 +740,58 @@ class InterfaceFilter(django_filters.FilterSet):
         null_value=None
     )
 
+    search_fields = ('name', 'description')
+
     class Meta:
         model = Interface
         fields = ['id', 'name', 'connection_status', 'type', 'enabled', 'mtu', 'mgmt_only', 'mode', 'description']
 
     def search(self, queryset, name, value):
-        if not value.strip():
+        value = value.strip()
+        if not value:
             return queryset
-        return queryset.filter(
-            Q(name__icontains=value) |
-            Q(description__icontains=value)
-        ).distinct()
+        return queryset.filter(_icontains_any(self.search_fields, value))
 
     def filter_device(self, queryset, name, value):
-        try:
-            device = Device.objects.get(**{name: value})
-            vc_interface_ids = device.vc_interfaces.values_list('id', flat=True)
-            return queryset.filter(pk__in=vc_interface_ids)
-        except Device.DoesNotExist:
-            return queryset.none()
+        return self._filter_vc_interfaces(queryset, name, value)
 
     def filter_device_id(self, queryset, name, id_list):
-        # Include interfaces belonging to peer virtual chassis members
-        vc_interface_ids = []
-        try:
-            devices = Device.objects.filter(pk__in=id_list)
-            for device in devices:
-                vc_interface_ids += device.vc_interfaces.values_list('id', flat=True)
-            return queryset.filter(pk__in=vc_interface_ids)
-        except Device.DoesNotExist:
-            return queryset.none()
+        return self._filter_vc_interfaces(queryset, '{}__in'.format(name), id_list)
+
+    def _filter_vc_interfaces(self, queryset, lookup, value):
+        # Include interfaces belonging to peer virtual chassis members (see Device.vc_interfaces), resolved within a
+        # single query rather than one query per device
+        return queryset.filter(
+            Q(**{'device__{}'.format(lookup): value}) |
+            Q(**{'device__virtual_chassis__master__{}'.format(lookup): value}, mgmt_only=False)
+        )
 
     def filter_vlan_id(self, queryset, name, value):
         value = value.strip()
         if not value:
             return queryset
+        # Match tagged VLANs with a subquery on the M2M table rather than a join, which would duplicate rows
+        tagged = Interface.tagged_vlans.through.objects.filter(vlan_id=value).values('interface')
         return queryset.filter(
             Q(untagged_vlan_id=value) |
-            Q(tagged_vlans=value)
+            Q(pk__in=tagged)
         )
 
     def filter_vlan(self, queryset, name, value):
         value = value.strip()
         if not value:
             return queryset
+        tagged = Interface.tagged_vlans.through.objects.filter(vlan__vid=value).values('interface')
         return queryset.filter(
             Q(untagged_vlan_id__vid=value) |
-            Q(tagged_vlans__vid=value)
+            Q(pk__in=tagged)
         )
 
     def filter_kind(self, queryset, name, value):
-        value = value.strip().lower()
-        return {
-            'physical': queryset.exclude(type__in=NONCONNECTABLE_IFACE_TYPES),
-            'virtual': queryset.filter(type__in=VIRTUAL_IFACE_TYPES),
-            'wireless': queryset.filter(type__in=WIRELESS_IFACE_TYPES),
-        }.get(value, queryset.none())
+        q = INTERFACE_KIND_QUERIES.get(value.strip().lower())
+        if q is None:
+            return queryset.none()
+        return queryset.filter(q)
 
 
 class FrontPortFilter(DeviceComponentFilterSet):
@@ -825,90 +831,91 @@ class InventoryItemFilter(DeviceComponentFilterSet):
         label='Search',
     )
     device_id = django_filters.ModelChoiceFilter(
-        queryset=Device.objects.all(),
+        queryset=Device.objects.only('pk'),
         label='Device (ID)',
     )
     device = django_filters.ModelChoiceFilter(
-        queryset=Device.objects.all(),
+        queryset=Device.objects.only('pk', 'name'),
         to_field_name='name',
         label='Device (name)',
     )
     parent_id = django_filters.ModelMultipleChoiceFilter(
-        queryset=InventoryItem.objects.all(),
+        queryset=InventoryItem.objects.only('pk'),
         label='Parent inventory item (ID)',
     )
     manufacturer_id = django_filters.ModelMultipleChoiceFilter(
-        queryset=Manufacturer.objects.all(),
+        queryset=Manufacturer.objects.only('pk'),
         label='Manufacturer (ID)',
     )
     manufacturer = django_filters.ModelMultipleChoiceFilter(
         field_name='manufacturer__slug',
-        queryset=Manufacturer.objects.all(),
+        queryset=Manufacturer.objects.only('pk', 'slug'),
         to_field_name='slug',
         label='Manufacturer (slug)',
     )
 
+    search_fields = ('name', 'part_id', 'description')
+
     class Meta:
         model = InventoryItem
         fields = ['id', 'name', 'part_id', 'serial', 'asset_tag', 'discovered']
 
     def search(self, queryset, name, value):
-        if not value.strip():
+        value = value.strip()
+        if not value:
             return queryset
         qs_filter = (
-            Q(name__icontains=value) |
-            Q(part_id__icontains=value) |
+            _icontains_any(self.search_fields, value) |
             Q(serial__iexact=value) |
-            Q(asset_tag__iexact=value) |
-            Q(description__icontains=value)
+            Q(asset_tag__iexact=value)
         )
         return queryset.filter(qs_filter)
 
 
-class VirtualChassisFilter(django_filters.FilterSet):
+class VirtualChassisFilter(BaseFilterSet):
     q = django_filters.CharFilter(
         method='search',
         label='Search',
     )
     site_id = django_filters.ModelMultipleChoiceFilter(
         field_name='master__site',
-        queryset=Site.objects.all(),
+        queryset=Site.objects.only('pk'),
         label='Site (ID)',
     )
     site = django_filters.ModelMultipleChoiceFilter(
         field_name='master__site__slug',
-        queryset=Site.objects.all(),
+        queryset=Site.objects.only('pk', 'slug'),
         to_field_name='slug',
         label='Site name (slug)',
     )
     tenant_id = django_filters.ModelMultipleChoiceFilter(
         field_name='master__tenant',
-        queryset=Tenant.objects.all(),
+        queryset=Tenant.objects.only('pk'),
         label='Tenant (ID)',
     )
     tenant = django_filters.ModelMultipleChoiceFilter(
         field_name='master__tenant__slug',
-        queryset=Tenant.objects.all(),
+        queryset=Tenant.objects.only('pk', 'slug'),
         to_field_name='slug',
         label='Tenant (slug)',
     )
     tag = TagFilter()
 
+    search_fields = ('master__name', 'domain')
+
     class Meta:
         model = VirtualChassis
         fields = ['id', 'domain']
 
     def search(self, queryset, name, value):
-        if not value.strip():
+        value = value.strip()
+        if not value:
             return queryset
-        qs_filter = (
-            Q(master__name__icontains=value) |
-            Q(domain__icontains=value)
-        )
+        qs_filter = _icontains_any(self.search_fields, value)
         return queryset.filter(qs_filter)
 
 
-class CableFilter(django_filters.FilterSet):
+class CableFilter(BaseFilterSet):
     q = django_filters.CharFilter(
         method='search',
         label='Search',
@@ -936,22 +943,22 @@ class CableFilter(django_filters.FilterSet):
         fields = ['id', 'label', 'length', 'length_unit']
 
     def search(self, queryset, name, value):
-        if not value.strip():
+        value = value.strip()
+        if not value:
             return queryset
         return queryset.filter(label__icontains=value)
 
     def filter_connected_device(self, queryset, name, value):
         if not value.strip():
             return queryset
-        try:
-            device = Device.objects.get(**{name: value})
-        except ObjectDoesNotExist:
-            return queryset.none()
-        cable_pks = device.get_cables(pk_list=True)
-        return queryset.filter(pk__in=cable_pks)
+        if name == 'pk':
+            devices = Device.objects.filter(pk=value)
+        else:
+            devices = Device.objects.filter(name=value)
+        return queryset.filter(get_device_cables_filter(devices))
 
 
-class ConsoleConnectionFilter(django_filters.FilterSet):
+class ConsoleConnectionFilter(BaseFilterSet):
     site = django_filters.CharFilter(
         method='filter_site',
         label='Site (slug)',
@@ -973,13 +980,16 @@ class ConsoleConnectionFilter(django_filters.FilterSet):
     def filter_device(self, queryset, name, value):
         if not value.strip():
             return queryset
+        # Match device names once, within a subquery (served by the trigram index on Device.name), rather than
+        # joining the Device table from both ends of the connection
+        devices = Device.objects.filter(name__icontains=value).values('pk')
         return queryset.filter(
-            Q(device__name__icontains=value) |
-            Q(connected_endpoint__device__name__icontains=value)
+            Q(device__in=devices) |
+            Q(connected_endpoint__device__in=devices)
         )
 
 
-class PowerConnectionFilter(django_filters.FilterSet):
+class PowerConnectionFilter(BaseFilterSet):
     site = django_filters.CharFilter(
         method='filter_site',
         label='Site (slug)',
@@ -1001,13 +1011,16 @@ class PowerConnectionFilter(django_filters.FilterSet):
     def filter_device(self, queryset, name, value):
         if not value.strip():
             return queryset
+        # Match device names once, within a subquery (served by the trigram index on Device.name), rather than
+        # joining the Device table from both ends of the connection
+        devices = Device.objects.filter(name__icontains=value).values('pk')
         return queryset.filter(
-            Q(device__name__icontains=value) |
-            Q(_connected_poweroutlet__device__name__icontains=value)
+            Q(device__in=devices) |
+            Q(_connected_poweroutlet__device__in=devices)
         )
 
 
-class InterfaceConnectionFilter(django_filters.FilterSet):
+class InterfaceConnectionFilter(BaseFilterSet):
     site = django_filters.CharFilter(
         method='filter_site',
         label='Site (slug)',
@@ -1024,21 +1037,27 @@ class InterfaceConnectionFilter(django_filters.FilterSet):
     def filter_site(self, queryset, name, value):
         if not value.strip():
             return queryset
+        # Resolve the site's devices once, within a subquery, rather than joining Device and Site from both ends of
+        # the connection
+        devices = Device.objects.filter(site__slug=value).values('pk')
         return queryset.filter(
-            Q(device__site__slug=value) |
-            Q(_connected_interface__device__site__slug=value)
+            Q(device__in=devices) |
+            Q(_connected_interface__device__in=devices)
         )
 
     def filter_device(self, queryset, name, value):
         if not value.strip():
             return queryset
+        # Match device names once, within a subquery (served by the trigram index on Device.name), rather than
+        # joining the Device table from both ends of the connection
+        devices = Device.objects.filter(name__icontains=value).values('pk')
         return queryset.filter(
-            Q(device__name__icontains=value) |
-            Q(_connected_interface__device__name__icontains=value)
+            Q(device__in=devices) |
+            Q(_connected_interface__device__in=devices)
         )
 
 
-class PowerPanelFilter(django_filters.FilterSet):
+class PowerPanelFilter(BaseFilterSet):
     id__in = NumericInFilter(
         field_name='id',
         lookup_expr='in'
@@ -1048,18 +1067,18 @@ class PowerPanelFilter(django_filters.FilterSet):
         label='Search',
     )
     site_id = django_filters.ModelMultipleChoiceFilter(
-        queryset=Site.objects.all(),
+        queryset=Site.objects.only('pk'),
         label='Site (ID)',
     )
     site = django_filters.ModelMultipleChoiceFilter(
         field_name='site__slug',
-        queryset=Site.objects.all(),
+        queryset=Site.objects.only('pk', 'slug'),
         to_field_name='slug',
         label='Site name (slug)',
     )
     rack_group_id = django_filters.ModelMultipleChoiceFilter(
         field_name='rack_group',
-        queryset=RackGroup.objects.all(),
+        queryset=RackGroup.objects.only('pk'),
         label='Rack group (ID)',
     )
 
@@ -1068,7 +1087,8 @@ class PowerPanelFilter(django_filters.FilterSet):
         fields = ['name']
 
     def search(self, queryset, name, value):
-        if not value.strip():
+        value = value.strip()
+        if not value:
             return queryset
         qs_filter = (
             Q(name__icontains=value)
@@ -1087,35 +1107,35 @@ class PowerFeedFilter(CustomFieldFilterSet):
     )
     site_id = django_filters.ModelMultipleChoiceFilter(
         field_name='power_panel__site',
-        queryset=Site.objects.all(),
+        queryset=Site.objects.only('pk'),
         label='Site (ID)',
     )
     site = django_filters.ModelMultipleChoiceFilter(
         field_name='power_panel__site__slug',
-        queryset=Site.objects.all(),
+        queryset=Site.objects.only('pk', 'slug'),
         to_field_name='slug',
         label='Site name (slug)',
     )
     power_panel_id = django_filters.ModelMultipleChoiceFilter(
-        queryset=PowerPanel.objects.all(),
+        queryset=PowerPanel.objects.only('pk'),
         label='Power panel (ID)',
     )
     rack_id = django_filters.ModelMultipleChoiceFilter(
         field_name='rack',
-        queryset=Rack.objects.all(),
+        queryset=Rack.objects.only('pk'),
         label='Rack (ID)',
     )
     tag = TagFilter()
 
+    search_fields = ('name', 'comments')
+
     class Meta:
         model = PowerFeed
         fields = ['name', 'status', 'type', 'supply', 'phase', 'voltage', 'amperage', 'max_utilization']
 
     def search(self, queryset, name, value):
-        if not value.strip():
+        value = value.strip()
+        if not value:
             return queryset
-        qs_filter = (
-            Q(name__icontains=value) |
-            Q(comments__icontains=value)
-        )
+        qs_filter = _icontains_any(self.search_fields, value)
         return queryset.filter(qs_filter)
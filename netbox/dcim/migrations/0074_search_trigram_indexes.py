@@ -0,0 +1,41 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+# Columns matched with __icontains by the DCIM filter sets' search methods. Django renders these lookups as
+# UPPER("column"::text) LIKE UPPER('%value%'), so each index is built on the same expression.
+SEARCH_COLUMNS = {
+    'dcim_site': [
+        'name', 'facility', 'description', 'physical_address', 'shipping_address', 'contact_name', 'contact_phone',
+        'contact_email', 'comments',
+    ],
+    'dcim_rack': ['name', 'facility_id', 'serial', 'asset_tag', 'comments'],
+    'dcim_rackreservation': ['description'],
+    'dcim_devicetype': ['model', 'part_number', 'comments'],
+    'dcim_device': ['name', 'serial', 'asset_tag', 'comments'],
+    'dcim_inventoryitem': ['name', 'part_id', 'serial', 'description'],
+    'dcim_virtualchassis': ['domain'],
+    'dcim_cable': ['label'],
+}
+
+
+def trigram_index_operations():
+    for table, columns in SEARCH_COLUMNS.items():
+        for column in columns:
+            index_name = '{}_{}_trgm'.format(table, column)
+            yield migrations.RunSQL(
+                sql='CREATE INDEX {} ON {} USING gin (UPPER({}::text) gin_trgm_ops)'.format(index_name, table, column),
+                reverse_sql='DROP INDEX {}'.format(index_name)
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dcim', '0073_interface_form_factor_to_type'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        *trigram_index_operations(),
+    ]
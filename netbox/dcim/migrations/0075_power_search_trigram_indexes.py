@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+# Columns matched with __icontains by PowerPanelFilter.search and PowerFeedFilter.search. As in
+# 0074_search_trigram_indexes, each index is built on the UPPER("column"::text) expression Django emits.
+SEARCH_COLUMNS = {
+    'dcim_powerpanel': ['name'],
+    'dcim_powerfeed': ['name', 'comments'],
+}
+
+
+def trigram_index_operations():
+    for table, columns in SEARCH_COLUMNS.items():
+        for column in columns:
+            index_name = '{}_{}_trgm'.format(table, column)
+            yield migrations.RunSQL(
+                sql='CREATE INDEX {} ON {} USING gin (UPPER({}::text) gin_trgm_ops)'.format(index_name, table, column),
+                reverse_sql='DROP INDEX {}'.format(index_name)
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dcim', '0074_search_trigram_indexes'),
+    ]
+
+    operations = [
+        *trigram_index_operations(),
+    ]
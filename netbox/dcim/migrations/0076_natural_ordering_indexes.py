@@ -0,0 +1,33 @@
+from django.db import migrations
+
+
+# The expressions NaturalOrderingManager selects as _nat1, _nat2 and _nat3 (see utilities.managers). They are
+# repeated here verbatim so that the planner can match ORDER BY _nat1, _nat2, _nat3 against the index.
+NATURAL_ORDERING_EXPRESSIONS = (
+    r"CAST(SUBSTRING({table}.name FROM '^(\d{{1,9}})') AS integer)",
+    r"SUBSTRING({table}.name FROM '^\d*(.*?)\d*$')",
+    r"CAST(SUBSTRING({table}.name FROM '(\d{{1,9}})$') AS integer)",
+)
+
+NATURAL_ORDERING_TABLES = ('dcim_site', 'dcim_rack', 'dcim_device')
+
+
+def natural_ordering_index_operations():
+    for table in NATURAL_ORDERING_TABLES:
+        index_name = '{}_name_natural'.format(table)
+        expressions = ', '.join('({})'.format(e.format(table=table)) for e in NATURAL_ORDERING_EXPRESSIONS)
+        yield migrations.RunSQL(
+            sql='CREATE INDEX {} ON {} ({})'.format(index_name, table, expressions),
+            reverse_sql='DROP INDEX {}'.format(index_name)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dcim', '0075_power_search_trigram_indexes'),
+    ]
+
+    operations = [
+        *natural_ordering_index_operations(),
+    ]
@@ -583,12 +583,14 @@ class Rack(ChangeLoggedModel, CustomFieldModel):
                             min_height
                         )
                     })
-            # Validate that Rack was assigned a group of its same site, if applicable
-            if self.group:
-                if self.group.site != self.site:
-                    raise ValidationError({
-                        'group': "Rack group must be from the same site, {}.".format(self.site)
-                    })
+
+        # Validate that Rack was assigned a group of its same site, if applicable. (A missing site is reported by
+        # field validation; the rack may not have been saved yet.)
+        if self.group_id is not None and self.site_id is not None:
+            if self.group.site_id != self.site_id:
+                raise ValidationError({
+                    'group': "Rack group must be from the same site, {}.".format(self.site)
+                })
 
     def save(self, *args, **kwargs):
 
@@ -629,7 +631,7 @@ class Rack(ChangeLoggedModel, CustomFieldModel):
         if self.desc_units:
             return range(1, self.u_height + 1)
         else:
-            return reversed(range(1, self.u_height + 1))
+            return range(self.u_height, 0, -1)
 
     @property
     def display_name(self):
@@ -690,8 +692,13 @@ class Rack(ChangeLoggedModel, CustomFieldModel):
         :param exclude: List of devices IDs to exclude (useful when moving a device within a rack)
         """
 
-        # Gather all devices which consume U space within the rack
-        devices = self.devices.select_related('device_type').filter(position__gte=1).exclude(pk__in=exclude)
+        # Gather all devices which consume U space within the rack, reusing the devices if they have been prefetched
+        if 'devices' in getattr(self, '_prefetched_objects_cache', {}):
+            devices = [
+                d for d in self.devices.all() if d.position is not None and d.position >= 1 and d.pk not in exclude
+            ]
+        else:
+            devices = self.devices.select_related('device_type').filter(position__gte=1).exclude(pk__in=exclude)
 
         # Initialize the rack unit skeleton
         units = list(range(1, self.u_height + 1))
@@ -736,19 +743,27 @@ class Rack(ChangeLoggedModel, CustomFieldModel):
 
     def get_power_utilization(self):
         """
-        Determine the utilization rate of power in the rack and return it as a percentage.
+        Determine the utilization rate of power in the rack and return it as a percentage. Power feeds prefetched
+        with an allocated_draw_total annotation are used instead of querying the database.
         """
-        power_stats = PowerFeed.objects.filter(
-            rack=self
-        ).annotate(
-            allocated_draw_total=Sum('connected_endpoint__poweroutlets__connected_endpoint__allocated_draw'),
-        ).values(
-            'allocated_draw_total',
-            'available_power'
-        )
+        if 'powerfeed_set' in getattr(self, '_prefetched_objects_cache', {}):
+            power_stats = [
+                {'allocated_draw_total': f.allocated_draw_total, 'available_power': f.available_power}
+                for f in self.powerfeed_set.all()
+            ]
+        else:
+            power_stats = PowerFeed.objects.filter(
+                rack=self
+            ).annotate(
+                allocated_draw_total=Sum('connected_endpoint__poweroutlets__connected_endpoint__allocated_draw'),
+            ).values(
+                'allocated_draw_total',
+                'available_power'
+            )
 
         if power_stats:
-            allocated_draw_total = sum(x['allocated_draw_total'] for x in power_stats)
+            # The draw total is None for a feed which powers no allocated draw
+            allocated_draw_total = sum(x['allocated_draw_total'] or 0 for x in power_stats)
             available_power_total = sum(x['available_power'] for x in power_stats)
             return int(allocated_draw_total / available_power_total * 100) or 0
         return 0
@@ -1754,16 +1769,10 @@ class Device(ChangeLoggedModel, ConfigContextModel, CustomFieldModel):
         """
         Return a QuerySet or PK list matching all Cables connected to a component of this Device.
         """
-        cable_pks = []
-        for component_model in [
-            ConsolePort, ConsoleServerPort, PowerPort, PowerOutlet, Interface, FrontPort, RearPort
-        ]:
-            cable_pks += component_model.objects.filter(
-                device=self, cable__isnull=False
-            ).values_list('cable', flat=True)
+        cables = Cable.objects.filter(get_device_cables_filter(Device.objects.filter(pk=self.pk)))
         if pk_list:
-            return cable_pks
-        return Cable.objects.filter(pk__in=cable_pks)
+            return list(cables.values_list('pk', flat=True))
+        return cables
 
     def get_children(self):
         """
@@ -2661,6 +2670,21 @@ class VirtualChassis(ChangeLoggedModel):
 # Cables
 #
 
+def get_device_cables_filter(devices):
+    """
+    Return a Q object matching all Cables connected to a component of any Device in the given QuerySet.
+    """
+    # Match cables against a subquery per component type, so that the whole lookup is a single query
+    cable_filter = Q()
+    for component_model in [
+        ConsolePort, ConsoleServerPort, PowerPort, PowerOutlet, Interface, FrontPort, RearPort
+    ]:
+        cable_filter |= Q(pk__in=component_model.objects.filter(
+            device__in=devices.values('pk'), cable__isnull=False
+        ).values('cable'))
+    return cable_filter
+
+
 class Cable(ChangeLoggedModel):
     """
     A physical connection between two endpoints.
@@ -1,8 +1,10 @@
 import django_tables2 as tables
 from django_tables2.utils import Accessor
 
-from tenancy.tables import COL_TENANT
-from utilities.tables import BaseTable, BooleanColumn, ColorColumn, ToggleColumn
+from tenancy.tables import TenantColumn
+from utilities.tables import (
+    BaseTable, BooleanColumn, ChoiceFieldColumn, ColorColumn, ColoredLabelColumn, TemplateColumn, ToggleColumn,
+)
 from .models import (
     Cable, ConsolePort, ConsolePortTemplate, ConsoleServerPort, ConsoleServerPortTemplate, Device, DeviceBay,
     DeviceBayTemplate, DeviceRole, DeviceType, FrontPort, FrontPortTemplate, Interface, InterfaceTemplate,
@@ -12,10 +14,10 @@ from .models import (
 )
 
 REGION_LINK = """
-{% if record.get_children %}
-    <span style="padding-left: {{ record.get_ancestors|length }}0px "><i class="fa fa-caret-right"></i>
+{% if not record.is_leaf_node %}
+    <span style="padding-left: {{ record.level }}0px "><i class="fa fa-caret-right"></i>
 {% else %}
-    <span style="padding-left: {{ record.get_ancestors|length }}9px">
+    <span style="padding-left: {{ record.level }}9px">
 {% endif %}
     <a href="{% url 'dcim:site_list' %}?region={{ record.slug }}">{{ record.name }}</a>
 </span>
@@ -72,14 +74,6 @@ RACKROLE_ACTIONS = """
 {% endif %}
 """
 
-RACK_ROLE = """
-{% if record.role %}
-    <label class="label" style="background-color: #{{ record.role.color }}">{{ value }}</label>
-{% else %}
-    &mdash;
-{% endif %}
-"""
-
 RACK_DEVICE_COUNT = """
 <a href="{% url 'dcim:device_list' %}?rack_id={{ record.pk }}">{{ value }}</a>
 """
@@ -136,19 +130,6 @@ PLATFORM_ACTIONS = """
 {% endif %}
 """
 
-DEVICE_ROLE = """
-{% load helpers %}
-<label class="label" style="color: {{ record.device_role.color|fgcolor }}; background-color: #{{ record.device_role.color }}">{{ value }}</label>
-"""
-
-STATUS_LABEL = """
-<span class="label label-{{ record.get_status_class }}">{{ record.get_status_display }}</span>
-"""
-
-TYPE_LABEL = """
-<span class="label label-{{ record.get_type_class }}">{{ record.get_type_display }}</span>
-"""
-
 DEVICE_PRIMARY_IP = """
 {{ record.primary_ip6.address.ip|default:"" }}
 {% if record.primary_ip6 and record.primary_ip4 %}<br />{% endif %}
@@ -200,10 +181,10 @@ POWERPANEL_POWERFEED_COUNT = """
 
 class RegionTable(BaseTable):
     pk = ToggleColumn()
-    name = tables.TemplateColumn(template_code=REGION_LINK, orderable=False)
+    name = TemplateColumn(template_code=REGION_LINK, orderable=False)
     site_count = tables.Column(verbose_name='Sites')
     slug = tables.Column(verbose_name='Slug')
-    actions = tables.TemplateColumn(
+    actions = TemplateColumn(
         template_code=REGION_ACTIONS,
         attrs={'td': {'class': 'text-right noprint'}},
         verbose_name=''
@@ -221,9 +202,9 @@ class RegionTable(BaseTable):
 class SiteTable(BaseTable):
     pk = ToggleColumn()
     name = tables.LinkColumn(order_by=('_nat1', '_nat2', '_nat3'))
-    status = tables.TemplateColumn(template_code=STATUS_LABEL, verbose_name='Status')
-    region = tables.TemplateColumn(template_code=SITE_REGION_LINK)
-    tenant = tables.TemplateColumn(template_code=COL_TENANT)
+    status = ChoiceFieldColumn(verbose_name='Status')
+    region = TemplateColumn(template_code=SITE_REGION_LINK)
+    tenant = TenantColumn()
 
     class Meta(BaseTable.Meta):
         model = Site
@@ -246,7 +227,7 @@ class RackGroupTable(BaseTable):
         verbose_name='Racks'
     )
     slug = tables.Column()
-    actions = tables.TemplateColumn(
+    actions = TemplateColumn(
         template_code=RACKGROUP_ACTIONS,
         attrs={'td': {'class': 'text-right noprint'}},
         verbose_name=''
@@ -265,10 +246,13 @@ class RackRoleTable(BaseTable):
     pk = ToggleColumn()
     name = tables.LinkColumn(verbose_name='Name')
     rack_count = tables.Column(verbose_name='Racks')
-    color = tables.TemplateColumn(COLOR_LABEL, verbose_name='Color')
+    color = TemplateColumn(COLOR_LABEL, verbose_name='Color')
     slug = tables.Column(verbose_name='Slug')
-    actions = tables.TemplateColumn(template_code=RACKROLE_ACTIONS, attrs={'td': {'class': 'text-right noprint'}},
-                                    verbose_name='')
+    actions = TemplateColumn(
+        template_code=RACKROLE_ACTIONS,
+        attrs={'td': {'class': 'text-right noprint'}},
+        verbose_name=''
+    )
 
     class Meta(BaseTable.Meta):
         model = RackRole
@@ -284,10 +268,10 @@ class RackTable(BaseTable):
     name = tables.LinkColumn(order_by=('_nat1', '_nat2', '_nat3'))
     site = tables.LinkColumn('dcim:site', args=[Accessor('site.slug')])
     group = tables.Column(accessor=Accessor('group.name'), verbose_name='Group')
-    tenant = tables.TemplateColumn(template_code=COL_TENANT)
-    status = tables.TemplateColumn(STATUS_LABEL)
-    role = tables.TemplateColumn(RACK_ROLE)
-    u_height = tables.TemplateColumn("{{ record.u_height }}U", verbose_name='Height')
+    tenant = TenantColumn()
+    status = ChoiceFieldColumn()
+    role = ColoredLabelColumn()
+    u_height = TemplateColumn("{{ record.u_height }}U", verbose_name='Height')
 
     class Meta(BaseTable.Meta):
         model = Rack
@@ -295,16 +279,16 @@ class RackTable(BaseTable):
 
 
 class RackDetailTable(RackTable):
-    device_count = tables.TemplateColumn(
+    device_count = TemplateColumn(
         template_code=RACK_DEVICE_COUNT,
         verbose_name='Devices'
     )
-    get_utilization = tables.TemplateColumn(
+    get_utilization = TemplateColumn(
         template_code=UTILIZATION_GRAPH,
         orderable=False,
         verbose_name='Space'
     )
-    get_power_utilization = tables.TemplateColumn(
+    get_power_utilization = TemplateColumn(
         template_code=UTILIZATION_GRAPH,
         orderable=False,
         verbose_name='Power'
@@ -328,10 +312,10 @@ class RackReservationTable(BaseTable):
         accessor=Accessor('rack.site'),
         args=[Accessor('rack.site.slug')],
     )
-    tenant = tables.TemplateColumn(template_code=COL_TENANT)
+    tenant = TenantColumn()
     rack = tables.LinkColumn('dcim:rack', args=[Accessor('rack.pk')])
     unit_list = tables.Column(orderable=False, verbose_name='Units')
-    actions = tables.TemplateColumn(
+    actions = TemplateColumn(
         template_code=RACKRESERVATION_ACTIONS, attrs={'td': {'class': 'text-right noprint'}}, verbose_name=''
     )
 
@@ -357,7 +341,7 @@ class ManufacturerTable(BaseTable):
         verbose_name='Platforms'
     )
     slug = tables.Column()
-    actions = tables.TemplateColumn(
+    actions = TemplateColumn(
         template_code=MANUFACTURER_ACTIONS,
         attrs={'td': {'class': 'text-right noprint'}},
         verbose_name=''
@@ -380,11 +364,12 @@ class DeviceTypeTable(BaseTable):
         verbose_name='Device Type'
     )
     is_full_depth = BooleanColumn(verbose_name='Full Depth')
-    subdevice_role = tables.TemplateColumn(
+    # Not a plain Column: get_subdevice_role_display() renders the None choice as "None" rather than the em dash
+    subdevice_role = TemplateColumn(
         template_code=SUBDEVICE_ROLE_TEMPLATE,
         verbose_name='Subdevice Role'
     )
-    instance_count = tables.TemplateColumn(
+    instance_count = TemplateColumn(
         template_code=DEVICETYPE_INSTANCES_TEMPLATE,
         verbose_name='Instances'
     )
@@ -439,7 +424,7 @@ class PowerOutletTemplateTable(BaseTable):
 
 class InterfaceTemplateTable(BaseTable):
     pk = ToggleColumn()
-    mgmt_only = tables.TemplateColumn("{% if value %}OOB Management{% endif %}")
+    mgmt_only = TemplateColumn("{% if value %}OOB Management{% endif %}")
 
     class Meta(BaseTable.Meta):
         model = InterfaceTemplate
@@ -480,21 +465,19 @@ class DeviceBayTemplateTable(BaseTable):
 
 class DeviceRoleTable(BaseTable):
     pk = ToggleColumn()
-    device_count = tables.TemplateColumn(
+    device_count = TemplateColumn(
         template_code=DEVICEROLE_DEVICE_COUNT,
-        accessor=Accessor('devices.count'),
-        orderable=False,
+        accessor=Accessor('device_count'),
         verbose_name='Devices'
     )
-    vm_count = tables.TemplateColumn(
+    vm_count = TemplateColumn(
         template_code=DEVICEROLE_VM_COUNT,
-        accessor=Accessor('virtual_machines.count'),
-        orderable=False,
+        accessor=Accessor('vm_count'),
         verbose_name='VMs'
     )
-    color = tables.TemplateColumn(COLOR_LABEL, verbose_name='Label')
+    color = TemplateColumn(COLOR_LABEL, verbose_name='Label')
     slug = tables.Column(verbose_name='Slug')
-    actions = tables.TemplateColumn(
+    actions = TemplateColumn(
         template_code=DEVICEROLE_ACTIONS,
         attrs={'td': {'class': 'text-right noprint'}},
         verbose_name=''
@@ -511,19 +494,17 @@ class DeviceRoleTable(BaseTable):
 
 class PlatformTable(BaseTable):
     pk = ToggleColumn()
-    device_count = tables.TemplateColumn(
+    device_count = TemplateColumn(
         template_code=PLATFORM_DEVICE_COUNT,
-        accessor=Accessor('devices.count'),
-        orderable=False,
+        accessor=Accessor('device_count'),
         verbose_name='Devices'
     )
-    vm_count = tables.TemplateColumn(
+    vm_count = TemplateColumn(
         template_code=PLATFORM_VM_COUNT,
-        accessor=Accessor('virtual_machines.count'),
-        orderable=False,
+        accessor=Accessor('vm_count'),
         verbose_name='VMs'
     )
-    actions = tables.TemplateColumn(
+    actions = TemplateColumn(
         template_code=PLATFORM_ACTIONS,
         attrs={'td': {'class': 'text-right noprint'}},
         verbose_name=''
@@ -540,15 +521,15 @@ class PlatformTable(BaseTable):
 
 class DeviceTable(BaseTable):
     pk = ToggleColumn()
-    name = tables.TemplateColumn(
+    name = TemplateColumn(
         order_by=('_nat1', '_nat2', '_nat3'),
         template_code=DEVICE_LINK
     )
-    status = tables.TemplateColumn(template_code=STATUS_LABEL, verbose_name='Status')
-    tenant = tables.TemplateColumn(template_code=COL_TENANT)
+    status = ChoiceFieldColumn(verbose_name='Status')
+    tenant = TenantColumn()
     site = tables.LinkColumn('dcim:site', args=[Accessor('site.slug')])
     rack = tables.LinkColumn('dcim:rack', args=[Accessor('rack.pk')])
-    device_role = tables.TemplateColumn(DEVICE_ROLE, verbose_name='Role')
+    device_role = ColoredLabelColumn(verbose_name='Role')
     device_type = tables.LinkColumn(
         'dcim:devicetype', args=[Accessor('device_type.pk')], verbose_name='Type',
         text=lambda record: record.device_type.display_name
@@ -560,7 +541,7 @@ class DeviceTable(BaseTable):
 
 
 class DeviceDetailTable(DeviceTable):
-    primary_ip = tables.TemplateColumn(
+    primary_ip = TemplateColumn(
         orderable=False, verbose_name='IP Address', template_code=DEVICE_PRIMARY_IP
     )
 
@@ -570,9 +551,9 @@ class DeviceDetailTable(DeviceTable):
 
 
 class DeviceImportTable(BaseTable):
-    name = tables.TemplateColumn(template_code=DEVICE_LINK, verbose_name='Name')
-    status = tables.TemplateColumn(template_code=STATUS_LABEL, verbose_name='Status')
-    tenant = tables.TemplateColumn(template_code=COL_TENANT)
+    name = TemplateColumn(template_code=DEVICE_LINK, verbose_name='Name')
+    status = ChoiceFieldColumn(verbose_name='Status')
+    tenant = TenantColumn()
     site = tables.LinkColumn('dcim:site', args=[Accessor('site.slug')], verbose_name='Site')
     rack = tables.LinkColumn('dcim:rack', args=[Accessor('rack.pk')], verbose_name='Rack')
     position = tables.Column(verbose_name='Position')
@@ -658,7 +639,7 @@ class CableTable(BaseTable):
         args=[Accessor('pk')],
         verbose_name='ID'
     )
-    termination_a_parent = tables.TemplateColumn(
+    termination_a_parent = TemplateColumn(
         template_code=CABLE_TERMINATION_PARENT,
         accessor=Accessor('termination_a'),
         orderable=False,
@@ -669,7 +650,7 @@ class CableTable(BaseTable):
         orderable=False,
         verbose_name=''
     )
-    termination_b_parent = tables.TemplateColumn(
+    termination_b_parent = TemplateColumn(
         template_code=CABLE_TERMINATION_PARENT,
         accessor=Accessor('termination_b'),
         orderable=False,
@@ -680,10 +661,8 @@ class CableTable(BaseTable):
         orderable=False,
         verbose_name=''
     )
-    status = tables.TemplateColumn(
-        template_code=STATUS_LABEL
-    )
-    length = tables.TemplateColumn(
+    status = ChoiceFieldColumn()
+    length = TemplateColumn(
         template_code=CABLE_LENGTH,
         order_by='_abs_length'
     )
@@ -811,7 +790,7 @@ class VirtualChassisTable(BaseTable):
     pk = ToggleColumn()
     master = tables.LinkColumn()
     member_count = tables.Column(verbose_name='Members')
-    actions = tables.TemplateColumn(
+    actions = TemplateColumn(
         template_code=VIRTUALCHASSIS_ACTIONS,
         attrs={'td': {'class': 'text-right noprint'}},
         verbose_name=''
@@ -833,7 +812,7 @@ class PowerPanelTable(BaseTable):
         viewname='dcim:site',
         args=[Accessor('site.slug')]
     )
-    powerfeed_count = tables.TemplateColumn(
+    powerfeed_count = TemplateColumn(
         template_code=POWERPANEL_POWERFEED_COUNT,
         verbose_name='Feeds'
     )
@@ -858,12 +837,8 @@ class PowerFeedTable(BaseTable):
         viewname='dcim:rack',
         args=[Accessor('rack.pk')]
     )
-    status = tables.TemplateColumn(
-        template_code=STATUS_LABEL
-    )
-    type = tables.TemplateColumn(
-        template_code=TYPE_LABEL
-    )
+    status = ChoiceFieldColumn()
+    type = ChoiceFieldColumn()
 
     class Meta(BaseTable.Meta):
         model = PowerFeed
@@ -3117,6 +3117,24 @@ class ConnectionTest(APITestCase):
         self.assertEqual(powerport1.connected_endpoint, poweroutlet1)
         self.assertEqual(poweroutlet1.connected_endpoint, powerport1)
 
+    def test_list_power_connections(self):
+
+        powerport1 = PowerPort.objects.create(
+            device=self.device1, name='Test Power Port 1'
+        )
+        poweroutlet1 = PowerOutlet.objects.create(
+            device=self.device2, name='Test Power Outlet 1'
+        )
+        Cable(termination_a=powerport1, termination_b=poweroutlet1).save()
+
+        url = reverse('dcim-api:powerconnections-list')
+        response = self.client.get(url, **self.header)
+
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['connected_endpoint_type'], 'dcim.poweroutlet')
+        self.assertEqual(response.data['results'][0]['connected_endpoint']['id'], poweroutlet1.pk)
+
     # Note: Power connections via patch ports are not supported.
 
     def test_create_direct_interface_connection(self):
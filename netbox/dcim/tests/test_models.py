@@ -1,99 +1,97 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings, tag
 
 from dcim.constants import *
 from dcim.models import *
 
 
+@tag('dcim', 'models')
+@override_settings(CACHEOPS_ENABLED=False)
 class RackTestCase(TestCase):
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
 
-        self.site1 = Site.objects.create(
+        cls.site1 = Site.objects.create(
             name='TestSite1',
             slug='test-site-1'
         )
-        self.site2 = Site.objects.create(
+        cls.site2 = Site.objects.create(
             name='TestSite2',
             slug='test-site-2'
         )
-        self.group1 = RackGroup.objects.create(
+        cls.group1 = RackGroup.objects.create(
             name='TestGroup1',
             slug='test-group-1',
-            site=self.site1
+            site=cls.site1
         )
-        self.group2 = RackGroup.objects.create(
+        cls.group2 = RackGroup.objects.create(
             name='TestGroup2',
             slug='test-group-2',
-            site=self.site2
+            site=cls.site2
         )
-        self.rack = Rack.objects.create(
+        cls.rack = Rack.objects.create(
             name='TestRack1',
             facility_id='A101',
-            site=self.site1,
-            group=self.group1,
+            site=cls.site1,
+            group=cls.group1,
             u_height=42
         )
-        self.manufacturer = Manufacturer.objects.create(
+        cls.manufacturer = Manufacturer.objects.create(
             name='Acme',
             slug='acme'
         )
 
-        self.device_type = {
-            'ff2048': DeviceType.objects.create(
-                manufacturer=self.manufacturer,
-                model='FrameForwarder 2048',
-                slug='ff2048'
-            ),
-            'cc5000': DeviceType.objects.create(
-                manufacturer=self.manufacturer,
-                model='CurrentCatapult 5000',
-                slug='cc5000',
-                u_height=0
-            ),
+        cls.device_type = {
+            device_type.slug: device_type for device_type in DeviceType.objects.bulk_create([
+                DeviceType(
+                    manufacturer=cls.manufacturer,
+                    model='FrameForwarder 2048',
+                    slug='ff2048'
+                ),
+                DeviceType(
+                    manufacturer=cls.manufacturer,
+                    model='CurrentCatapult 5000',
+                    slug='cc5000',
+                    u_height=0
+                ),
+            ])
         }
-        self.role = {
-            'Server': DeviceRole.objects.create(
-                name='Server',
-                slug='server',
-            ),
-            'Switch': DeviceRole.objects.create(
-                name='Switch',
-                slug='switch',
-            ),
-            'Console Server': DeviceRole.objects.create(
-                name='Console Server',
-                slug='console-server',
-            ),
-            'PDU': DeviceRole.objects.create(
-                name='PDU',
-                slug='pdu',
-            ),
-
+        cls.role = {
+            role.name: role for role in DeviceRole.objects.bulk_create([
+                DeviceRole(
+                    name='Server',
+                    slug='server',
+                ),
+                DeviceRole(
+                    name='Switch',
+                    slug='switch',
+                ),
+                DeviceRole(
+                    name='Console Server',
+                    slug='console-server',
+                ),
+                DeviceRole(
+                    name='PDU',
+                    slug='pdu',
+                ),
+            ])
         }
 
     def test_rack_device_outside_height(self):
 
-        rack1 = Rack(
-            name='TestRack2',
-            facility_id='A102',
-            site=self.site1,
-            u_height=42
-        )
-        rack1.save()
-
         device1 = Device(
             name='TestSwitch1',
-            device_type=DeviceType.objects.get(manufacturer__slug='acme', slug='ff2048'),
-            device_role=DeviceRole.objects.get(slug='switch'),
+            device_type=self.device_type['ff2048'],
+            device_role=self.role['Switch'],
             site=self.site1,
-            rack=rack1,
+            rack=self.rack,
             position=43,
             face=RACK_FACE_FRONT,
         )
         device1.save()
 
         with self.assertRaises(ValidationError):
-            rack1.clean()
+            self.rack.clean()
 
     def test_rack_group_site(self):
 
@@ -104,17 +102,27 @@ class RackTestCase(TestCase):
             u_height=42,
             group=self.group2
         )
-        rack_invalid_group.save()
 
         with self.assertRaises(ValidationError):
             rack_invalid_group.clean()
 
+    def test_rack_group_without_site(self):
+
+        # An unsaved rack with no site must leave the missing site to field validation rather than fail in clean()
+        rack_no_site = Rack(
+            name='TestRack2',
+            facility_id='A102',
+            u_height=42,
+            group=self.group1
+        )
+        rack_no_site.clean()
+
     def test_mount_single_device(self):
 
         device1 = Device(
             name='TestSwitch1',
-            device_type=DeviceType.objects.get(manufacturer__slug='acme', slug='ff2048'),
-            device_role=DeviceRole.objects.get(slug='switch'),
+            device_type=self.device_type['ff2048'],
+            device_role=self.role['Switch'],
             site=self.site1,
             rack=self.rack,
             position=10,
@@ -123,21 +131,21 @@ class RackTestCase(TestCase):
         device1.save()
 
         # Validate rack height
-        self.assertEqual(list(self.rack.units), list(reversed(range(1, 43))))
+        self.assertEqual(tuple(self.rack.units), tuple(range(42, 0, -1)))
+        self.assertEqual(len(self.rack.units), 42)
+        self.assertIn(5, self.rack.units)
 
         # Validate inventory (front face)
-        rack1_inventory_front = self.rack.get_front_elevation()
-        self.assertEqual(rack1_inventory_front[-10]['device'], device1)
-        del(rack1_inventory_front[-10])
-        for u in rack1_inventory_front:
-            self.assertIsNone(u['device'])
+        with self.assertNumQueries(1):
+            rack1_inventory_front = [u['device'] for u in self.rack.get_front_elevation()]
+        self.assertEqual(rack1_inventory_front[-10], device1)
+        self.assertEqual(rack1_inventory_front[:-10] + rack1_inventory_front[-9:], [None] * 41)
 
         # Validate inventory (rear face)
-        rack1_inventory_rear = self.rack.get_rear_elevation()
-        self.assertEqual(rack1_inventory_rear[-10]['device'], device1)
-        del(rack1_inventory_rear[-10])
-        for u in rack1_inventory_rear:
-            self.assertIsNone(u['device'])
+        with self.assertNumQueries(1):
+            rack1_inventory_rear = [u['device'] for u in self.rack.get_rear_elevation()]
+        self.assertEqual(rack1_inventory_rear[-10], device1)
+        self.assertEqual(rack1_inventory_rear[:-10] + rack1_inventory_rear[-9:], [None] * 41)
 
     def test_mount_zero_ru(self):
         pdu = Device.objects.create(
@@ -152,177 +160,170 @@ class RackTestCase(TestCase):
         self.assertTrue(pdu)
 
 
-class CableTestCase(TestCase):
-
-    def setUp(self):
+@tag('dcim', 'models')
+@override_settings(CACHEOPS_ENABLED=False)
+class DeviceTestCase(TestCase):
+    """
+    Creates the site, device type and device role shared by tests which only need some devices to work with.
+    """
+    @classmethod
+    def setUpTestData(cls):
 
-        site = Site.objects.create(name='Test Site 1', slug='test-site-1')
-        manufacturer = Manufacturer.objects.create(name='Test Manufacturer 1', slug='test-manufacturer-1')
-        devicetype = DeviceType.objects.create(
-            manufacturer=manufacturer, model='Test Device Type 1', slug='test-device-type-1'
+        cls.site = Site.objects.create(name='Test Site 1', slug='test-site-1')
+        cls.manufacturer = Manufacturer.objects.create(name='Test Manufacturer 1', slug='test-manufacturer-1')
+        cls.devicetype = DeviceType.objects.create(
+            manufacturer=cls.manufacturer, model='Test Device Type 1', slug='test-device-type-1'
         )
-        devicerole = DeviceRole.objects.create(
+        cls.devicerole = DeviceRole.objects.create(
             name='Test Device Role 1', slug='test-device-role-1', color='ff0000'
         )
-        self.device1 = Device.objects.create(
-            device_type=devicetype, device_role=devicerole, name='TestDevice1', site=site
-        )
-        self.device2 = Device.objects.create(
-            device_type=devicetype, device_role=devicerole, name='TestDevice2', site=site
+
+
+class CableTestCase(DeviceTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+
+        super().setUpTestData()
+
+        # The device type has no component templates, so Device.save() has nothing to add for these devices
+        cls.device1, cls.device2, cls.patch_pannel = Device.objects.bulk_create([
+            Device(device_type=cls.devicetype, device_role=cls.devicerole, name='TestDevice1', site=cls.site),
+            Device(device_type=cls.devicetype, device_role=cls.devicerole, name='TestDevice2', site=cls.site),
+            Device(device_type=cls.devicetype, device_role=cls.devicerole, name='TestPatchPannel', site=cls.site),
+        ])
+        cls.power_port1 = PowerPort.objects.create(device=cls.device2, name='psu1')
+        cls.rear_port = RearPort.objects.create(device=cls.patch_pannel, name='R1', type=1000)
+        cls.front_port = FrontPort.objects.create(
+            device=cls.patch_pannel, name='F1', type=1000, rear_port=cls.rear_port
         )
-        self.interface1 = Interface.objects.create(device=self.device1, name='eth0')
-        self.interface2 = Interface.objects.create(device=self.device2, name='eth0')
+
+    def setUp(self):
+
+        # The cable and its interfaces are modified in memory by the tests, so create them for each test
+        self.interface1, self.interface2 = Interface.objects.bulk_create([
+            Interface(device=self.device1, name='eth0'),
+            Interface(device=self.device2, name='eth0'),
+        ])
         self.cable = Cable(termination_a=self.interface1, termination_b=self.interface2)
         self.cable.save()
 
-        self.power_port1 = PowerPort.objects.create(device=self.device2, name='psu1')
-        self.patch_pannel = Device.objects.create(
-            device_type=devicetype, device_role=devicerole, name='TestPatchPannel', site=site
-        )
-        self.rear_port = RearPort.objects.create(device=self.patch_pannel, name='R1', type=1000)
-        self.front_port = FrontPort.objects.create(
-            device=self.patch_pannel, name='F1', type=1000, rear_port=self.rear_port
-        )
-
     def test_cable_creation(self):
         """
         When a new Cable is created, it must be cached on either termination point.
         """
-        interface1 = Interface.objects.get(pk=self.interface1.pk)
-        self.assertEqual(self.cable.termination_a, interface1)
-        interface2 = Interface.objects.get(pk=self.interface2.pk)
-        self.assertEqual(self.cable.termination_b, interface2)
+        self.interface1.refresh_from_db(fields=['cable'])
+        self.assertEqual(self.interface1.cable, self.cable)
+        self.interface2.refresh_from_db(fields=['cable'])
+        self.assertEqual(self.interface2.cable, self.cable)
 
     def test_cable_deletion(self):
         """
         When a Cable is deleted, the `cable` field on its termination points must be nullified.
         """
         self.cable.delete()
-        interface1 = Interface.objects.get(pk=self.interface1.pk)
-        self.assertIsNone(interface1.cable)
-        interface2 = Interface.objects.get(pk=self.interface2.pk)
-        self.assertIsNone(interface2.cable)
+        self.interface1.refresh_from_db(fields=['cable'])
+        self.assertIsNone(self.interface1.cable)
+        self.interface2.refresh_from_db(fields=['cable'])
+        self.assertIsNone(self.interface2.cable)
 
     def test_cabletermination_deletion(self):
         """
         When a CableTermination object is deleted, its attached Cable (if any) must also be deleted.
         """
         self.interface1.delete()
-        cable = Cable.objects.filter(pk=self.cable.pk).first()
-        self.assertIsNone(cable)
+        self.assertFalse(Cable.objects.filter(pk=self.cable.pk).exists())
 
-    def test_cable_validates_compatibale_types(self):
+    def test_cable_validation_errors(self):
         """
-        The clean method should have a check to ensure only compatiable port types can be connected by a cable
+        The clean method must reject each of these invalid cables.
         """
-        # An interface cannot be connected to a power port
-        cable = Cable(termination_a=self.interface1, termination_b=self.power_port1)
-        with self.assertRaises(ValidationError):
-            cable.clean()
+        cases = (
+            # An interface cannot be connected to a power port
+            ('incompatible types', self.interface1, self.power_port1),
+            # A cable cannot be made with the same A and B side terminations
+            ('same termination', self.interface1, self.interface1),
+            # A cable cannot connect a front port to its corresponding rear port
+            ('corresponding rear port', self.front_port, self.rear_port),
+            # Either side of a cable cannot be terminated when that side already has a connection
+            ('existing connection', self.interface2, self.interface1),
+            # A cable connection cannot include a virtual interface
+            ('virtual interface', self.interface2, Interface(device=self.device1, name="V1", type=0)),
+        )
+        for case, termination_a, termination_b in cases:
+            with self.subTest(case):
+                cable = Cable(termination_a=termination_a, termination_b=termination_b)
+                with self.assertRaises(ValidationError):
+                    cable.clean()
 
-    def test_cable_cannot_have_the_same_terminination_on_both_ends(self):
-        """
-        A cable cannot be made with the same A and B side terminations
-        """
-        cable = Cable(termination_a=self.interface1, termination_b=self.interface1)
-        with self.assertRaises(ValidationError):
-            cable.clean()
 
-    def test_cable_front_port_cannot_connect_to_corresponding_rear_port(self):
-        """
-        A cable cannot connect a front port to its sorresponding rear port
-        """
-        cable = Cable(termination_a=self.front_port, termination_b=self.rear_port)
-        with self.assertRaises(ValidationError):
-            cable.clean()
+class CablePathTestCase(DeviceTestCase):
 
-    def test_cable_cannot_be_connected_to_an_existing_connection(self):
-        """
-        Either side of a cable cannot be terminated when that side aready has a connection
-        """
-        # Try to create a cable with the same interface terminations
-        cable = Cable(termination_a=self.interface2, termination_b=self.interface1)
-        with self.assertRaises(ValidationError):
-            cable.clean()
+    # The Interface fields which record the far end of a traced path
+    connection_fields = ('_connected_interface', '_connected_circuittermination', 'connection_status')
 
-    def test_cable_cannot_connect_to_a_virtual_inteface(self):
-        """
-        A cable connection cannot include a virtual interface
-        """
-        virtual_interface = Interface(device=self.device1, name="V1", type=0)
-        cable = Cable(termination_a=self.interface2, termination_b=virtual_interface)
-        with self.assertRaises(ValidationError):
-            cable.clean()
+    @classmethod
+    def setUpTestData(cls):
 
+        super().setUpTestData()
 
-class CablePathTestCase(TestCase):
+        # The device type has no component templates, so Device.save() has nothing to add for these devices
+        cls.device1, cls.device2, cls.panel1, cls.panel2 = Device.objects.bulk_create([
+            Device(device_type=cls.devicetype, device_role=cls.devicerole, name='Test Device 1', site=cls.site),
+            Device(device_type=cls.devicetype, device_role=cls.devicerole, name='Test Device 2', site=cls.site),
+            Device(device_type=cls.devicetype, device_role=cls.devicerole, name='Test Panel 1', site=cls.site),
+            Device(device_type=cls.devicetype, device_role=cls.devicerole, name='Test Panel 2', site=cls.site),
+        ])
 
     def setUp(self):
 
-        site = Site.objects.create(name='Test Site 1', slug='test-site-1')
-        manufacturer = Manufacturer.objects.create(name='Test Manufacturer 1', slug='test-manufacturer-1')
-        devicetype = DeviceType.objects.create(
-            manufacturer=manufacturer, model='Test Device Type 1', slug='test-device-type-1'
-        )
-        devicerole = DeviceRole.objects.create(
-            name='Test Device Role 1', slug='test-device-role-1', color='ff0000'
-        )
-        self.device1 = Device.objects.create(
-            device_type=devicetype, device_role=devicerole, name='Test Device 1', site=site
-        )
-        self.device2 = Device.objects.create(
-            device_type=devicetype, device_role=devicerole, name='Test Device 2', site=site
-        )
-        self.interface1 = Interface.objects.create(device=self.device1, name='eth0')
-        self.interface2 = Interface.objects.create(device=self.device2, name='eth0')
-        self.panel1 = Device.objects.create(
-            device_type=devicetype, device_role=devicerole, name='Test Panel 1', site=site
-        )
-        self.panel2 = Device.objects.create(
-            device_type=devicetype, device_role=devicerole, name='Test Panel 2', site=site
-        )
-        self.rear_port1 = RearPort.objects.create(
-            device=self.panel1, name='Rear Port 1', type=PORT_TYPE_8P8C
-        )
-        self.front_port1 = FrontPort.objects.create(
-            device=self.panel1, name='Front Port 1', type=PORT_TYPE_8P8C, rear_port=self.rear_port1
-        )
-        self.rear_port2 = RearPort.objects.create(
-            device=self.panel2, name='Rear Port 2', type=PORT_TYPE_8P8C
-        )
-        self.front_port2 = FrontPort.objects.create(
-            device=self.panel2, name='Front Port 2', type=PORT_TYPE_8P8C, rear_port=self.rear_port2
-        )
+        # Cable terminations are modified in memory as cables are connected, so create them for each test
+        self.interface1, self.interface2 = Interface.objects.bulk_create([
+            Interface(device=self.device1, name='eth0'),
+            Interface(device=self.device2, name='eth0'),
+        ])
+        self.rear_port1, self.rear_port2 = RearPort.objects.bulk_create([
+            RearPort(device=self.panel1, name='Rear Port 1', type=PORT_TYPE_8P8C),
+            RearPort(device=self.panel2, name='Rear Port 2', type=PORT_TYPE_8P8C),
+        ])
+        self.front_port1, self.front_port2 = FrontPort.objects.bulk_create([
+            FrontPort(device=self.panel1, name='Front Port 1', type=PORT_TYPE_8P8C, rear_port=self.rear_port1),
+            FrontPort(device=self.panel2, name='Front Port 2', type=PORT_TYPE_8P8C, rear_port=self.rear_port2),
+        ])
 
     def test_path_completion(self):
 
         # First segment
         cable1 = Cable(termination_a=self.interface1, termination_b=self.front_port1)
         cable1.save()
-        interface1 = Interface.objects.get(pk=self.interface1.pk)
-        self.assertIsNone(interface1.connected_endpoint)
-        self.assertIsNone(interface1.connection_status)
+        with self.assertNumQueries(1):
+            self.interface1.refresh_from_db(fields=self.connection_fields)
+            self.assertIsNone(self.interface1.connected_endpoint)
+            self.assertIsNone(self.interface1.connection_status)
 
         # Second segment
         cable2 = Cable(termination_a=self.rear_port1, termination_b=self.rear_port2)
         cable2.save()
-        interface1 = Interface.objects.get(pk=self.interface1.pk)
-        self.assertIsNone(interface1.connected_endpoint)
-        self.assertIsNone(interface1.connection_status)
+        with self.assertNumQueries(1):
+            self.interface1.refresh_from_db(fields=self.connection_fields)
+            self.assertIsNone(self.interface1.connected_endpoint)
+            self.assertIsNone(self.interface1.connection_status)
 
         # Third segment
         cable3 = Cable(termination_a=self.front_port2, termination_b=self.interface2, status=CONNECTION_STATUS_PLANNED)
         cable3.save()
-        interface1 = Interface.objects.get(pk=self.interface1.pk)
-        self.assertEqual(interface1.connected_endpoint, self.interface2)
-        self.assertEqual(interface1.connection_status, CONNECTION_STATUS_PLANNED)
+        with self.assertNumQueries(1):
+            interface1 = Interface.objects.select_related('_connected_interface').get(pk=self.interface1.pk)
+            self.assertEqual(interface1.connected_endpoint, self.interface2)
+            self.assertEqual(interface1.connection_status, CONNECTION_STATUS_PLANNED)
 
         # Switch third segment from planned to connected
         cable3.status = CONNECTION_STATUS_CONNECTED
         cable3.save()
-        interface1 = Interface.objects.get(pk=self.interface1.pk)
-        self.assertEqual(interface1.connected_endpoint, self.interface2)
-        self.assertEqual(interface1.connection_status, CONNECTION_STATUS_CONNECTED)
+        with self.assertNumQueries(1):
+            interface1 = Interface.objects.select_related('_connected_interface').get(pk=self.interface1.pk)
+            self.assertEqual(interface1.connected_endpoint, self.interface2)
+            self.assertEqual(interface1.connection_status, CONNECTION_STATUS_CONNECTED)
 
     def test_path_teardown(self):
 
@@ -333,15 +334,15 @@ class CablePathTestCase(TestCase):
         cable2.save()
         cable3 = Cable(termination_a=self.front_port2, termination_b=self.interface2)
         cable3.save()
-        interface1 = Interface.objects.get(pk=self.interface1.pk)
-        self.assertEqual(interface1.connected_endpoint, self.interface2)
-        self.assertEqual(interface1.connection_status, CONNECTION_STATUS_CONNECTED)
+        self.interface1.refresh_from_db(fields=self.connection_fields)
+        self.assertEqual(self.interface1.connected_endpoint, self.interface2)
+        self.assertEqual(self.interface1.connection_status, CONNECTION_STATUS_CONNECTED)
 
         # Remove a cable
         cable2.delete()
-        interface1 = Interface.objects.get(pk=self.interface1.pk)
-        self.assertIsNone(interface1.connected_endpoint)
-        self.assertIsNone(interface1.connection_status)
-        interface2 = Interface.objects.get(pk=self.interface2.pk)
-        self.assertIsNone(interface2.connected_endpoint)
-        self.assertIsNone(interface2.connection_status)
+        self.interface1.refresh_from_db(fields=self.connection_fields)
+        self.assertIsNone(self.interface1.connected_endpoint)
+        self.assertIsNone(self.interface1.connection_status)
+        self.interface2.refresh_from_db(fields=self.connection_fields)
+        self.assertIsNone(self.interface2.connected_endpoint)
+        self.assertIsNone(self.interface2.connection_status)
@@ -5,8 +5,8 @@ from django.urls import reverse
 
 from dcim.constants import CABLE_TYPE_CAT6, IFACE_TYPE_1GE_FIXED
 from dcim.models import (
-    Cable, Device, DeviceRole, DeviceType, Interface, InventoryItem, Manufacturer, Platform, Rack, RackGroup,
-    RackReservation, RackRole, Site, Region, VirtualChassis,
+    Cable, Device, DeviceRole, DeviceType, Interface, InventoryItem, Manufacturer, Platform, PowerFeed, PowerOutlet,
+    PowerPanel, PowerPort, Rack, RackGroup, RackReservation, RackRole, Site, Region, VirtualChassis,
 )
 from utilities.testing import create_test_user
 
@@ -161,6 +161,34 @@ class RackTestCase(TestCase):
         response = self.client.get('{}?{}'.format(url, urllib.parse.urlencode(params)))
         self.assertEqual(response.status_code, 200)
 
+    def test_rack_list_power_utilization(self):
+
+        site = Site.objects.first()
+        rack = Rack.objects.get(name='Rack 1')
+        manufacturer = Manufacturer.objects.create(name='Manufacturer 1', slug='manufacturer-1')
+        devicetype = DeviceType.objects.create(manufacturer=manufacturer, model='Device Type 1', slug='device-type-1')
+        devicerole = DeviceRole.objects.create(name='Device Role 1', slug='device-role-1')
+        pdu = Device.objects.create(device_type=devicetype, device_role=devicerole, name='PDU 1', site=site)
+        server = Device.objects.create(device_type=devicetype, device_role=devicerole, name='Server 1', site=site)
+
+        # Feed (1920W available) -> PDU power port -> PDU outlet -> server power port (192W allocated)
+        pdu_powerport = PowerPort.objects.create(device=pdu, name='PSU 1')
+        poweroutlet = PowerOutlet.objects.create(device=pdu, name='Outlet 1', power_port=pdu_powerport)
+        PowerPort.objects.create(device=server, name='PSU 1', allocated_draw=192, _connected_poweroutlet=poweroutlet)
+        powerpanel = PowerPanel.objects.create(site=site, name='Power Panel 1')
+        PowerFeed.objects.create(
+            power_panel=powerpanel, rack=rack, name='Power Feed 1', voltage=120, amperage=20, max_utilization=80,
+            connected_endpoint=pdu_powerport
+        )
+        # A second rack has a feed which powers no allocated draw
+        PowerFeed.objects.create(
+            power_panel=powerpanel, rack=Rack.objects.get(name='Rack 2'), name='Power Feed 2'
+        )
+
+        response = self.client.get(reverse('dcim:rack_list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'aria-valuenow="10"')
+
     def test_rack(self):
 
         rack = Rack.objects.first()
@@ -6,7 +6,8 @@ from django.contrib.auth.mixins import PermissionRequiredMixin
 from django.contrib.contenttypes.models import ContentType
 from django.core.paginator import EmptyPage, PageNotAnInteger
 from django.db import transaction
-from django.db.models import Count, F
+from django.db.models import CharField, Count, F, Prefetch, Sum, Value
+from django.db.models.functions import Coalesce
 from django.forms import modelformset_factory
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
@@ -22,7 +23,7 @@ from ipam.models import Prefix, VLAN
 from ipam.tables import InterfaceIPAddressTable, InterfaceVLANTable
 from utilities.forms import ConfirmationForm
 from utilities.paginator import EnhancedPaginator
-from utilities.utils import csv_format
+from utilities.utils import csv_format, get_subquery
 from utilities.views import (
     BulkComponentCreateView, BulkDeleteView, BulkEditView, BulkImportView, ComponentCreateView, GetReturnURLMixin,
     ObjectDeleteView, ObjectEditView, ObjectListView,
@@ -55,24 +56,32 @@ class BulkRenameView(GetReturnURLMixin, View):
             selected_objects = self.queryset.filter(pk__in=form.initial['pk'])
 
             if form.is_valid():
-                for obj in selected_objects:
-                    find = form.cleaned_data['find']
-                    replace = form.cleaned_data['replace']
-                    if form.cleaned_data['use_regex']:
+                find = form.cleaned_data['find']
+                replace = form.cleaned_data['replace']
+                if form.cleaned_data['use_regex']:
+                    # The form has already validated the expression, so compile it once for all objects
+                    sub = re.compile(find).sub
+                    for obj in selected_objects:
                         try:
-                            obj.new_name = re.sub(find, replace, obj.name)
+                            obj.new_name = sub(replace, obj.name)
                         # Catch regex group reference errors
                         except re.error:
                             obj.new_name = obj.name
-                    else:
+                else:
+                    for obj in selected_objects:
                         obj.new_name = obj.name.replace(find, replace)
 
                 if '_apply' in request.POST:
-                    for obj in selected_objects:
-                        obj.name = obj.new_name
-                        obj.save()
+                    # Save each renamed object individually so that its change is logged, but within one transaction
+                    renamed_count = 0
+                    with transaction.atomic():
+                        for obj in selected_objects:
+                            if obj.new_name != obj.name:
+                                obj.name = obj.new_name
+                                obj.save()
+                                renamed_count += 1
                     messages.success(request, "Renamed {} {}".format(
-                        len(selected_objects),
+                        renamed_count,
                         model._meta.verbose_name_plural
                     ))
                     return redirect(self.get_return_url(request))
@@ -109,12 +118,14 @@ class BulkDisconnectView(GetReturnURLMixin, View):
 
                 with transaction.atomic():
 
-                    count = 0
-                    for obj in self.model.objects.filter(pk__in=form.cleaned_data['pk']):
-                        if obj.cable is None:
-                            continue
-                        obj.cable.delete()
-                        count += 1
+                    # Delete the attached cables together. Cable deletion signals still fire for each cable, so that
+                    # both of its terminations are cleared and the change is logged.
+                    cable_ids = list(self.model.objects.filter(
+                        pk__in=form.cleaned_data['pk'], cable__isnull=False
+                    ).values_list('cable', flat=True))
+                    Cable.objects.filter(pk__in=cable_ids).delete()
+                    # A cable whose two ends are both selected is only deleted (and counted) once
+                    count = len(set(cable_ids))
 
                 messages.success(request, "Disconnected {} {}".format(
                     count, self.model._meta.verbose_name_plural
@@ -191,21 +202,30 @@ class SiteListView(PermissionRequiredMixin, ObjectListView):
     table = tables.SiteTable
     template_name = 'dcim/site_list.html'
 
+    def alter_queryset(self, request):
+        # Skip loading large fields which the table does not display. (Exports use the unaltered queryset.)
+        return self.queryset.defer('physical_address', 'shipping_address', 'comments')
+
 
 class SiteView(PermissionRequiredMixin, View):
     permission_required = 'dcim.view_site'
 
     def get(self, request, slug):
 
-        site = get_object_or_404(Site.objects.select_related('region', 'tenant__group'), slug=slug)
-        stats = {
-            'rack_count': Rack.objects.filter(site=site).count(),
-            'device_count': Device.objects.filter(site=site).count(),
-            'prefix_count': Prefix.objects.filter(site=site).count(),
-            'vlan_count': VLAN.objects.filter(site=site).count(),
-            'circuit_count': Circuit.objects.filter(terminations__site=site).count(),
-            'vm_count': VirtualMachine.objects.filter(cluster__site=site).count(),
+        # Count related objects with subqueries so that all of the stats are retrieved along with the site itself
+        stats_subqueries = {
+            'rack_count': get_subquery(Rack, 'site'),
+            'device_count': get_subquery(Device, 'site'),
+            'prefix_count': get_subquery(Prefix, 'site'),
+            'vlan_count': get_subquery(VLAN, 'site'),
+            'circuit_count': get_subquery(Circuit, 'terminations__site'),
+            'vm_count': get_subquery(VirtualMachine, 'cluster__site'),
         }
+        site = get_object_or_404(
+            Site.objects.select_related('region', 'tenant__group').annotate(**stats_subqueries), slug=slug
+        )
+        # A subquery returns NULL rather than zero if the site has no related objects
+        stats = {name: getattr(site, name) or 0 for name in stats_subqueries}
         rack_groups = RackGroup.objects.filter(site=site).annotate(rack_count=Count('racks'))
         topology_maps = TopologyMap.objects.filter(site=site)
         show_graphs = Graph.objects.filter(type=GRAPH_TYPE_SITE).exists()
@@ -267,7 +287,9 @@ class SiteBulkDeleteView(PermissionRequiredMixin, BulkDeleteView):
 
 class RackGroupListView(PermissionRequiredMixin, ObjectListView):
     permission_required = 'dcim.view_rackgroup'
-    queryset = RackGroup.objects.select_related('site').annotate(rack_count=Count('racks'))
+    queryset = RackGroup.objects.select_related('site').annotate(
+        rack_count=Coalesce(get_subquery(Rack, 'group'), 0)
+    )
     filter = filters.RackGroupFilter
     filter_form = forms.RackGroupFilterForm
     table = tables.RackGroupTable
@@ -294,7 +316,9 @@ class RackGroupBulkImportView(PermissionRequiredMixin, BulkImportView):
 
 class RackGroupBulkDeleteView(PermissionRequiredMixin, BulkDeleteView):
     permission_required = 'dcim.delete_rackgroup'
-    queryset = RackGroup.objects.select_related('site').annotate(rack_count=Count('racks'))
+    queryset = RackGroup.objects.select_related('site').annotate(
+        rack_count=Coalesce(get_subquery(Rack, 'group'), 0)
+    )
     filter = filters.RackGroupFilter
     table = tables.RackGroupTable
     default_return_url = 'dcim:rackgroup_list'
@@ -306,7 +330,7 @@ class RackGroupBulkDeleteView(PermissionRequiredMixin, BulkDeleteView):
 
 class RackRoleListView(PermissionRequiredMixin, ObjectListView):
     permission_required = 'dcim.view_rackrole'
-    queryset = RackRole.objects.annotate(rack_count=Count('racks'))
+    queryset = RackRole.objects.annotate(rack_count=Coalesce(get_subquery(Rack, 'role'), 0))
     table = tables.RackRoleTable
     template_name = 'dcim/rackrole_list.html'
 
@@ -331,7 +355,7 @@ class RackRoleBulkImportView(PermissionRequiredMixin, BulkImportView):
 
 class RackRoleBulkDeleteView(PermissionRequiredMixin, BulkDeleteView):
     permission_required = 'dcim.delete_rackrole'
-    queryset = RackRole.objects.annotate(rack_count=Count('racks'))
+    queryset = RackRole.objects.annotate(rack_count=Coalesce(get_subquery(Rack, 'role'), 0))
     table = tables.RackRoleTable
     default_return_url = 'dcim:rackrole_list'
 
@@ -345,7 +369,13 @@ class RackListView(PermissionRequiredMixin, ObjectListView):
     queryset = Rack.objects.select_related(
         'site', 'group', 'tenant', 'role'
     ).prefetch_related(
-        'devices__device_type'
+        # Only the fields needed by Rack.get_available_units() to calculate utilization
+        Prefetch('devices', queryset=Device.objects.select_related('device_type').only(
+            'rack', 'position', 'face', 'device_type', 'device_type__u_height', 'device_type__is_full_depth'
+        )),
+        Prefetch('powerfeed_set', queryset=PowerFeed.objects.annotate(
+            allocated_draw_total=Sum('connected_endpoint__poweroutlets__connected_endpoint__allocated_draw')
+        ))
     ).annotate(
         device_count=Count('devices')
     )
@@ -354,6 +384,10 @@ class RackListView(PermissionRequiredMixin, ObjectListView):
     table = tables.RackDetailTable
     template_name = 'dcim/rack_list.html'
 
+    def alter_queryset(self, request):
+        # Skip loading large fields which the table does not display. (Exports use the unaltered queryset.)
+        return self.queryset.defer('comments')
+
 
 class RackElevationListView(PermissionRequiredMixin, View):
     """
@@ -369,12 +403,13 @@ class RackElevationListView(PermissionRequiredMixin, View):
             'devices__device_type'
         )
         racks = filters.RackFilter(request.GET, racks).qs
-        total_count = racks.count()
 
         # Pagination
         per_page = request.GET.get('per_page', settings.PAGINATE_COUNT)
         page_number = request.GET.get('page', 1)
         paginator = EnhancedPaginator(racks, per_page)
+        # Reuse the paginator's count rather than counting the racks a second time
+        total_count = paginator.count
         try:
             page = paginator.page(page_number)
         except PageNotAnInteger:
@@ -402,15 +437,34 @@ class RackView(PermissionRequiredMixin, View):
 
     def get(self, request, pk):
 
-        rack = get_object_or_404(Rack.objects.select_related('site__region', 'tenant__group', 'group', 'role'), pk=pk)
+        # Reservations are prefetched for reuse by both elevations (via Rack.get_reserved_units()) and the
+        # reservations table
+        rack = get_object_or_404(
+            Rack.objects.select_related('site__region', 'tenant__group', 'group', 'role').prefetch_related(
+                Prefetch('reservations', queryset=RackReservation.objects.select_related('tenant', 'user'))
+            ),
+            pk=pk
+        )
 
         nonracked_devices = Device.objects.filter(rack=rack, position__isnull=True, parent_bay__isnull=True) \
-            .select_related('device_type__manufacturer')
-        next_rack = Rack.objects.filter(site=rack.site, name__gt=rack.name).order_by('name').first()
-        prev_rack = Rack.objects.filter(site=rack.site, name__lt=rack.name).order_by('-name').first()
+            .select_related('device_type__manufacturer', 'device_role', 'parent_bay')
+
+        # Find the previous and next racks (by name) within the site using a single query
+        site_racks = Rack.objects.filter(site=rack.site)
+        neighbor_racks = site_racks.filter(name__lt=rack.name).order_by('-name').values('pk').annotate(
+            direction=Value('prev', output_field=CharField())
+        )[:1].union(
+            site_racks.filter(name__gt=rack.name).order_by('name').values('pk').annotate(
+                direction=Value('next', output_field=CharField())
+            )[:1],
+            all=True
+        )
+        neighbor_racks = {neighbor['direction']: neighbor for neighbor in neighbor_racks}
+        prev_rack = neighbor_racks.get('prev')
+        next_rack = neighbor_racks.get('next')
 
-        reservations = RackReservation.objects.filter(rack=rack)
-        power_feeds = PowerFeed.objects.filter(rack=rack).select_related('power_panel')
+        reservations = rack.reservations.all()
+        power_feeds = PowerFeed.objects.filter(rack=rack).select_related('power_panel', 'connected_endpoint')
 
         return render(request, 'dcim/rack.html', {
             'rack': rack,
@@ -472,7 +526,7 @@ class RackBulkDeleteView(PermissionRequiredMixin, BulkDeleteView):
 
 class RackReservationListView(PermissionRequiredMixin, ObjectListView):
     permission_required = 'dcim.view_rackreservation'
-    queryset = RackReservation.objects.select_related('rack__site')
+    queryset = RackReservation.objects.select_related('rack__site', 'tenant', 'user')
     filter = filters.RackReservationFilter
     filter_form = forms.RackReservationFilterForm
     table = tables.RackReservationTable
@@ -508,7 +562,7 @@ class RackReservationDeleteView(PermissionRequiredMixin, ObjectDeleteView):
 
 class RackReservationBulkEditView(PermissionRequiredMixin, BulkEditView):
     permission_required = 'dcim.change_rackreservation'
-    queryset = RackReservation.objects.select_related('rack', 'user')
+    queryset = RackReservation.objects.select_related('rack__site', 'tenant', 'user')
     filter = filters.RackReservationFilter
     table = tables.RackReservationTable
     form = forms.RackReservationBulkEditForm
@@ -517,7 +571,7 @@ class RackReservationBulkEditView(PermissionRequiredMixin, BulkEditView):
 
 class RackReservationBulkDeleteView(PermissionRequiredMixin, BulkDeleteView):
     permission_required = 'dcim.delete_rackreservation'
-    queryset = RackReservation.objects.select_related('rack', 'user')
+    queryset = RackReservation.objects.select_related('rack__site', 'tenant', 'user')
     filter = filters.RackReservationFilter
     table = tables.RackReservationTable
     default_return_url = 'dcim:rackreservation_list'
@@ -529,10 +583,11 @@ class RackReservationBulkDeleteView(PermissionRequiredMixin, BulkDeleteView):
 
 class ManufacturerListView(PermissionRequiredMixin, ObjectListView):
     permission_required = 'dcim.view_manufacturer'
+    # Count each relation with its own subquery, rather than joining all three and counting distinct rows
     queryset = Manufacturer.objects.annotate(
-        devicetype_count=Count('device_types', distinct=True),
-        inventoryitem_count=Count('inventory_items', distinct=True),
-        platform_count=Count('platforms', distinct=True),
+        devicetype_count=Coalesce(get_subquery(DeviceType, 'manufacturer'), 0),
+        inventoryitem_count=Coalesce(get_subquery(InventoryItem, 'manufacturer'), 0),
+        platform_count=Coalesce(get_subquery(Platform, 'manufacturer'), 0),
     )
     table = tables.ManufacturerTable
     template_name = 'dcim/manufacturer_list.html'
@@ -581,39 +636,50 @@ class DeviceTypeView(PermissionRequiredMixin, View):
 
     def get(self, request, pk):
 
-        devicetype = get_object_or_404(DeviceType, pk=pk)
+        # Prefetch the component templates, so that each table is built from an evaluated list rather than running
+        # its own COUNT and SELECT queries
+        devicetype = get_object_or_404(
+            DeviceType.objects.prefetch_related(
+                'consoleport_templates', 'consoleserverport_templates', 'powerport_templates',
+                Prefetch('poweroutlet_templates', queryset=PowerOutletTemplate.objects.select_related('power_port')),
+                'interface_templates',
+                Prefetch('frontport_templates', queryset=FrontPortTemplate.objects.select_related('rear_port')),
+                'rearport_templates', 'device_bay_templates'
+            ),
+            pk=pk
+        )
 
         # Component tables
         consoleport_table = tables.ConsolePortTemplateTable(
-            ConsolePortTemplate.objects.filter(device_type=devicetype),
+            devicetype.consoleport_templates.all(),
             orderable=False
         )
         consoleserverport_table = tables.ConsoleServerPortTemplateTable(
-            ConsoleServerPortTemplate.objects.filter(device_type=devicetype),
+            devicetype.consoleserverport_templates.all(),
             orderable=False
         )
         powerport_table = tables.PowerPortTemplateTable(
-            PowerPortTemplate.objects.filter(device_type=devicetype),
+            devicetype.powerport_templates.all(),
             orderable=False
         )
         poweroutlet_table = tables.PowerOutletTemplateTable(
-            PowerOutletTemplate.objects.filter(device_type=devicetype),
+            devicetype.poweroutlet_templates.all(),
             orderable=False
         )
         interface_table = tables.InterfaceTemplateTable(
-            list(InterfaceTemplate.objects.filter(device_type=devicetype)),
+            devicetype.interface_templates.all(),
             orderable=False
         )
         front_port_table = tables.FrontPortTemplateTable(
-            FrontPortTemplate.objects.filter(device_type=devicetype),
+            devicetype.frontport_templates.all(),
             orderable=False
         )
         rear_port_table = tables.RearPortTemplateTable(
-            RearPortTemplate.objects.filter(device_type=devicetype),
+            devicetype.rearport_templates.all(),
             orderable=False
         )
         devicebay_table = tables.DeviceBayTemplateTable(
-            DeviceBayTemplate.objects.filter(device_type=devicetype),
+            devicetype.device_bay_templates.all(),
             orderable=False
         )
         if request.user.has_perm('dcim.change_devicetype'):
@@ -835,7 +901,10 @@ class DeviceBayTemplateBulkDeleteView(PermissionRequiredMixin, BulkDeleteView):
 
 class DeviceRoleListView(PermissionRequiredMixin, ObjectListView):
     permission_required = 'dcim.view_devicerole'
-    queryset = DeviceRole.objects.all()
+    queryset = DeviceRole.objects.annotate(
+        device_count=Count('devices', distinct=True),
+        vm_count=Count('virtual_machines', distinct=True),
+    )
     table = tables.DeviceRoleTable
     template_name = 'dcim/devicerole_list.html'
 
@@ -860,7 +929,10 @@ class DeviceRoleBulkImportView(PermissionRequiredMixin, BulkImportView):
 
 class DeviceRoleBulkDeleteView(PermissionRequiredMixin, BulkDeleteView):
     permission_required = 'dcim.delete_devicerole'
-    queryset = DeviceRole.objects.all()
+    queryset = DeviceRole.objects.annotate(
+        device_count=Count('devices', distinct=True),
+        vm_count=Count('virtual_machines', distinct=True),
+    )
     table = tables.DeviceRoleTable
     default_return_url = 'dcim:devicerole_list'
 
@@ -871,7 +943,10 @@ class DeviceRoleBulkDeleteView(PermissionRequiredMixin, BulkDeleteView):
 
 class PlatformListView(PermissionRequiredMixin, ObjectListView):
     permission_required = 'dcim.view_platform'
-    queryset = Platform.objects.all()
+    queryset = Platform.objects.annotate(
+        device_count=Count('devices', distinct=True),
+        vm_count=Count('virtual_machines', distinct=True),
+    )
     table = tables.PlatformTable
     template_name = 'dcim/platform_list.html'
 
@@ -896,7 +971,10 @@ class PlatformBulkImportView(PermissionRequiredMixin, BulkImportView):
 
 class PlatformBulkDeleteView(PermissionRequiredMixin, BulkDeleteView):
     permission_required = 'dcim.delete_platform'
-    queryset = Platform.objects.all()
+    queryset = Platform.objects.annotate(
+        device_count=Count('devices', distinct=True),
+        vm_count=Count('virtual_machines', distinct=True),
+    )
     table = tables.PlatformTable
     default_return_url = 'dcim:platform_list'
 
@@ -915,6 +993,10 @@ class DeviceListView(PermissionRequiredMixin, ObjectListView):
     table = tables.DeviceDetailTable
     template_name = 'dcim/device_list.html'
 
+    def alter_queryset(self, request):
+        # Skip loading large fields which the table does not display. (Exports use the unaltered queryset.)
+        return self.queryset.defer('comments', 'local_context_data')
+
 
 class DeviceView(PermissionRequiredMixin, View):
     permission_required = 'dcim.view_device'
@@ -2297,7 +2379,7 @@ class PowerPanelBulkDeleteView(PermissionRequiredMixin, BulkDeleteView):
     queryset = PowerPanel.objects.select_related(
         'site', 'rack_group'
     ).annotate(
-        rack_count=Count('powerfeeds')
+        powerfeed_count=Count('powerfeeds')
     )
     filter = filters.PowerPanelFilter
     table = tables.PowerPanelTable
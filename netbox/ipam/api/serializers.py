@@ -12,7 +12,8 @@ from ipam.constants import *
 from ipam.models import Aggregate, IPAddress, Prefix, RIR, Role, Service, VLAN, VLANGroup, VRF
 from tenancy.api.nested_serializers import NestedTenantSerializer
 from utilities.api import (
-    ChoiceField, SerializedPKRelatedField, ValidatedModelSerializer, WritableNestedSerializer,
+    ChoiceField, SerializedPKRelatedField, TaggedObjectListSerializer, ValidatedModelSerializer,
+    WritableNestedSerializer,
 )
 from virtualization.api.nested_serializers import NestedVirtualMachineSerializer
 from .nested_serializers import *
@@ -30,6 +31,7 @@ class VRFSerializer(TaggitSerializer, CustomFieldModelSerializer):
 
     class Meta:
         model = VRF
+        list_serializer_class = TaggedObjectListSerializer
         fields = [
             'id', 'name', 'rd', 'tenant', 'enforce_unique', 'description', 'tags', 'display_name', 'custom_fields',
             'created', 'last_updated', 'ipaddress_count', 'prefix_count',
@@ -54,6 +56,7 @@ class AggregateSerializer(TaggitSerializer, CustomFieldModelSerializer):
 
     class Meta:
         model = Aggregate
+        list_serializer_class = TaggedObjectListSerializer
         fields = [
             'id', 'family', 'prefix', 'rir', 'date_added', 'description', 'tags', 'custom_fields', 'created',
             'last_updated',
@@ -109,6 +112,7 @@ class VLANSerializer(TaggitSerializer, CustomFieldModelSerializer):
 
     class Meta:
         model = VLAN
+        list_serializer_class = TaggedObjectListSerializer
         fields = [
             'id', 'site', 'group', 'vid', 'name', 'tenant', 'status', 'role', 'description', 'tags', 'display_name',
             'custom_fields', 'created', 'last_updated', 'prefix_count',
@@ -146,6 +150,7 @@ class PrefixSerializer(TaggitSerializer, CustomFieldModelSerializer):
 
     class Meta:
         model = Prefix
+        list_serializer_class = TaggedObjectListSerializer
         fields = [
             'id', 'family', 'prefix', 'site', 'vrf', 'tenant', 'vlan', 'status', 'role', 'is_pool', 'description',
             'tags', 'custom_fields', 'created', 'last_updated',
@@ -209,6 +214,7 @@ class IPAddressSerializer(TaggitSerializer, CustomFieldModelSerializer):
 
     class Meta:
         model = IPAddress
+        list_serializer_class = TaggedObjectListSerializer
         fields = [
             'id', 'family', 'address', 'vrf', 'tenant', 'status', 'role', 'interface', 'nat_inside',
             'nat_outside', 'dns_name', 'description', 'tags', 'custom_fields', 'created', 'last_updated',
@@ -3,16 +3,40 @@ from django.db.models import QuerySet
 from rest_framework import authentication, exceptions
 from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import DjangoModelPermissions, SAFE_METHODS
-from rest_framework.renderers import BrowsableAPIRenderer
-from rest_framework.utils import formatting
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+from rest_framework.utils import encoders, formatting
 
 from users.models import Token
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 #
 # Renderers
 #
 
+class ORJSONRenderer(JSONRenderer):
+    """
+    Render JSON using orjson, which is considerably faster than the standard library's json module on large nested
+    responses. Fall back to the built-in JSONRenderer if orjson is not installed or indented output has been requested.
+    """
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if data is None:
+            return bytes()
+
+        # Hand any types orjson does not support natively (e.g. lazy translation strings) to DRF's encoder
+        ret = orjson.dumps(data, default=encoders.JSONEncoder().default, option=orjson.OPT_NON_STR_KEYS)
+
+        # Escape U+2028 and U+2029 as JSONRenderer does, since they are not valid within JavaScript strings
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
 class FormlessBrowsableAPIRenderer(BrowsableAPIRenderer):
     """
     Override the built-in BrowsableAPIRenderer to disable HTML forms.
@@ -413,7 +413,7 @@ REST_FRAMEWORK = {
         'netbox.api.TokenPermissions',
     ),
     'DEFAULT_RENDERER_CLASSES': (
-        'rest_framework.renderers.JSONRenderer',
+        'netbox.api.ORJSONRenderer',
         'netbox.api.FormlessBrowsableAPIRenderer',
     ),
     'DEFAULT_VERSION': REST_FRAMEWORK_VERSION,
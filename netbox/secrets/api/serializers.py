@@ -5,7 +5,7 @@ from taggit_serializer.serializers import TaggitSerializer, TagListSerializerFie
 from dcim.api.nested_serializers import NestedDeviceSerializer
 from extras.api.customfields import CustomFieldModelSerializer
 from secrets.models import Secret, SecretRole
-from utilities.api import ValidatedModelSerializer
+from utilities.api import TaggedObjectListSerializer, ValidatedModelSerializer
 from .nested_serializers import *
 
 
@@ -29,6 +29,7 @@ class SecretSerializer(TaggitSerializer, CustomFieldModelSerializer):
 
     class Meta:
         model = Secret
+        list_serializer_class = TaggedObjectListSerializer
         fields = [
             'id', 'device', 'role', 'name', 'plaintext', 'hash', 'tags', 'custom_fields', 'created', 'last_updated',
         ]
@@ -3,7 +3,7 @@ from taggit_serializer.serializers import TaggitSerializer, TagListSerializerFie
 
 from extras.api.customfields import CustomFieldModelSerializer
 from tenancy.models import Tenant, TenantGroup
-from utilities.api import ValidatedModelSerializer
+from utilities.api import TaggedObjectListSerializer, ValidatedModelSerializer
 from .nested_serializers import *
 
 
@@ -34,6 +34,7 @@ class TenantSerializer(TaggitSerializer, CustomFieldModelSerializer):
 
     class Meta:
         model = Tenant
+        list_serializer_class = TaggedObjectListSerializer
         fields = [
             'id', 'name', 'slug', 'group', 'description', 'comments', 'tags', 'custom_fields', 'created',
             'last_updated', 'circuit_count', 'device_count', 'ipaddress_count', 'prefix_count', 'rack_count',
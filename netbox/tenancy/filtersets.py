@@ -1,8 +1,10 @@
 import django_filters
+
+from utilities.filters import BaseFilterSet
 from .models import Tenant, TenantGroup
 
 
-class TenancyFilterSet(django_filters.FilterSet):
+class TenancyFilterSet(BaseFilterSet):
     tenant_group_id = django_filters.ModelMultipleChoiceFilter(
         field_name='tenant__group__id',
         queryset=TenantGroup.objects.all(),
@@ -1,16 +1,20 @@
+import copy
 from collections import OrderedDict
+from functools import lru_cache
 
 import pytz
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
-from django.core.exceptions import FieldError, MultipleObjectsReturned, ObjectDoesNotExist
-from django.db.models import ManyToManyField, ProtectedError
+from django.core.exceptions import FieldDoesNotExist, FieldError, MultipleObjectsReturned, ObjectDoesNotExist
+from django.db.models import Manager, ManyToManyField, ProtectedError, prefetch_related_objects
 from django.http import Http404
+from django.utils.functional import cached_property
 from rest_framework.exceptions import APIException
+from rest_framework.fields import REGEX_TYPE
 from rest_framework.permissions import BasePermission
-from rest_framework.relations import PrimaryKeyRelatedField, RelatedField
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField, RelatedField
 from rest_framework.response import Response
-from rest_framework.serializers import Field, ModelSerializer, ValidationError
+from rest_framework.serializers import Field, ListSerializer, ModelSerializer, ValidationError
 from rest_framework.viewsets import ModelViewSet as _ModelViewSet, ViewSet
 
 from .utils import dict_to_filter_params, dynamic_import
@@ -27,9 +31,18 @@ class SerializerNotFound(Exception):
 
 def get_serializer_for_model(model, prefix=''):
     """
-    Dynamically resolve and return the appropriate serializer for a model.
+    Dynamically resolve and return the appropriate serializer for a model (or an instance of a model).
     """
-    app_name, model_name = model._meta.label.split('.')
+    return _get_serializer_for_label(model._meta.label, prefix)
+
+
+@lru_cache(maxsize=None)
+def _get_serializer_for_label(label, prefix):
+    """
+    Resolve the serializer for a model label (e.g. 'dcim.Interface'). The result is cached, since the set of models is
+    fixed and this is called for every object rendered with a dynamically-chosen nested serializer.
+    """
+    app_name, model_name = label.split('.')
     serializer_name = '{}.api.serializers.{}{}Serializer'.format(
         app_name, prefix, model_name
     )
@@ -63,16 +76,43 @@ class ChoiceField(Field):
     """
     Represent a ChoiceField as {'value': <DB value>, 'label': <string>}.
     """
+    # Maps id(choices) to (choices, unpacked dict). Choices are static constants, so each set is unpacked only once.
+    _choices_cache = {}
+
     def __init__(self, choices, **kwargs):
-        self._choices = dict()
+        self._choices = self._unpack_choices(choices)
+        super().__init__(**kwargs)
+
+    def __deepcopy__(self, memo):
+        # Mirror Field.__deepcopy__(), but also pass the static choices through as-is so that the copy can reuse the
+        # cached dict.
+        args = [
+            item if isinstance(item, REGEX_TYPE) else copy.deepcopy(item, memo)
+            for item in self._args
+        ]
+        kwargs = {
+            key: (value if key in ('choices', 'validators', 'regex') else copy.deepcopy(value, memo))
+            for key, value in self._kwargs.items()
+        }
+        return self.__class__(*args, **kwargs)
+
+    @classmethod
+    def _unpack_choices(cls, choices):
+        cached = cls._choices_cache.get(id(choices))
+        if cached is not None and cached[0] is choices:
+            return cached[1]
+
+        unpacked = dict()
         for k, v in choices:
             # Unpack grouped choices
             if type(v) in [list, tuple]:
                 for k2, v2 in v:
-                    self._choices[k2] = v2
+                    unpacked[k2] = v2
             else:
-                self._choices[k] = v
-        super().__init__(**kwargs)
+                unpacked[k] = v
+        cls._choices_cache[id(choices)] = (choices, unpacked)
+
+        return unpacked
 
     def to_representation(self, obj):
         if obj is '':
@@ -166,9 +206,42 @@ class SerializedPKRelatedField(PrimaryKeyRelatedField):
 # Serializers
 #
 
+class CachedFieldsMixin(object):
+    """
+    Cache the fields generated by ModelSerializer.get_fields() on the serializer class, so that model introspection is
+    performed only once per class rather than once per instance. Each instance receives its own copy of the cached
+    fields, since fields are bound to their parent serializer.
+    """
+    def get_fields(self):
+        cls = type(self)
+        if '_fields_cache' not in cls.__dict__:
+            cls._fields_cache = super().get_fields()
+        return copy.deepcopy(cls._fields_cache)
+
+
+class CountAnnotationMixin(object):
+    """
+    Declare the queryset annotations which populate a serializer's read-only object counts (e.g. device_count).
+    ModelViewSet applies these to its queryset, so that each count is computed as part of the query for the parent
+    objects rather than relying on every view to annotate it.
+    """
+    count_annotations = {}
+
+
+class TaggedObjectListSerializer(ListSerializer):
+    """
+    Fetch the tags for all objects in a single query before rendering them, rather than querying once per object as
+    TagListSerializerField does by default. Objects whose tags have already been prefetched are left untouched.
+    """
+    def to_representation(self, data):
+        instances = list(data.all() if isinstance(data, Manager) else data)
+        prefetch_related_objects(instances, 'tags')
+        return super().to_representation(instances)
+
+
 # TODO: We should probably take a fresh look at exactly what we're doing with this. There might be a more elegant
 # way to enforce model validation on the serializer.
-class ValidatedModelSerializer(ModelSerializer):
+class ValidatedModelSerializer(CachedFieldsMixin, ModelSerializer):
     """
     Extends the built-in ModelSerializer to enforce calling clean() on the associated model during validation.
     """
@@ -195,8 +268,16 @@ class ValidatedModelSerializer(ModelSerializer):
 
         return data
 
+    @cached_property
+    def _child_context(self):
+        """
+        Context for nested serializers instantiated while rendering each object (e.g. within a SerializerMethodField).
+        Built once per serializer rather than once per object.
+        """
+        return {'request': self.context['request']}
 
-class WritableNestedSerializer(ModelSerializer):
+
+class WritableNestedSerializer(CachedFieldsMixin, ModelSerializer):
     """
     Returns a nested representation of an object on read, but accepts only a primary key on write.
     """
@@ -248,6 +329,64 @@ class WritableNestedSerializer(ModelSerializer):
 # Viewsets
 #
 
+def _get_related_lookups(serializer, prefix=''):
+    """
+    Return the select_related() and prefetch_related() lookups needed to render a serializer's nested objects: a nested
+    serializer on a foreign key or one-to-one field is followed with select_related() (recursing into its own fields),
+    and a many-valued nested field with prefetch_related().
+    """
+    select_related = []
+    prefetch_related = []
+    model = serializer.Meta.model
+
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*' or '.' in field.source:
+            continue
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            continue
+        # Skip non-relational fields and generic foreign keys
+        if not model_field.is_relation or model_field.related_model is None:
+            continue
+
+        lookup = prefix + field.source
+        if isinstance(field, (ListSerializer, ManyRelatedField)):
+            if model_field.many_to_many or model_field.one_to_many:
+                prefetch_related.append(lookup)
+        elif isinstance(field, ModelSerializer) and (model_field.many_to_one or model_field.one_to_one):
+            select_related.append(lookup)
+            nested_select_related, nested_prefetch_related = _get_related_lookups(field, prefix=lookup + '__')
+            select_related.extend(nested_select_related)
+            prefetch_related.extend(nested_prefetch_related)
+
+    return select_related, prefetch_related
+
+
+class AutoPrefetchMixin(object):
+    """
+    Apply the select_related() and prefetch_related() lookups implied by the nested fields of the viewset's serializer,
+    so that rendering a list of objects does not incur a query per object per relation. The lookups are determined
+    once per serializer class.
+    """
+    _related_lookups_cache = {}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        serializer_class = self.get_serializer_class()
+        if serializer_class not in self._related_lookups_cache:
+            self._related_lookups_cache[serializer_class] = _get_related_lookups(serializer_class())
+        select_related, prefetch_related = self._related_lookups_cache[serializer_class]
+
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+
+        return queryset
+
+
 class ModelViewSet(_ModelViewSet):
     """
     Accept either a single object or a list of objects to create.
@@ -274,6 +413,17 @@ class ModelViewSet(_ModelViewSet):
         # Fall back to the hard-coded serializer class
         return self.serializer_class
 
+    def get_queryset(self):
+
+        # Annotate any object counts declared by the serializer. (This applies to brief requests as well, since nested
+        # serializers include a subset of the same counts.)
+        queryset = super().get_queryset()
+        count_annotations = getattr(self.serializer_class, 'count_annotations', None)
+        if count_annotations:
+            queryset = queryset.annotate(**count_annotations)
+
+        return queryset
+
     def dispatch(self, request, *args, **kwargs):
         try:
             return super().dispatch(request, *args, **kwargs)
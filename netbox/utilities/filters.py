@@ -105,7 +105,23 @@ class TagFilter(django_filters.ModelMultipleChoiceFilter):
 # FilterSets
 #
 
-class NameSlugSearchFilterSet(django_filters.FilterSet):
+class BaseFilterSet(django_filters.FilterSet):
+    """
+    Cache the form class generated for the FilterSet. django-filter otherwise builds a new Form class (and a new form
+    field for every filter) for each FilterSet instance, i.e. on every request. The cache is keyed on the instance's
+    filters, since some FilterSets add filters dynamically (e.g. for custom fields).
+    """
+    def get_form_class(self):
+        cls = type(self)
+        if '_form_class_cache' not in cls.__dict__:
+            cls._form_class_cache = {}
+        key = tuple((name, type(filter_)) for name, filter_ in self.filters.items())
+        if key not in cls._form_class_cache:
+            cls._form_class_cache[key] = super().get_form_class()
+        return cls._form_class_cache[key]
+
+
+class NameSlugSearchFilterSet(BaseFilterSet):
     """
     A base class for adding the search method to models which only expose the `name` and `slug` fields
     """
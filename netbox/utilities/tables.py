@@ -1,6 +1,10 @@
 import django_tables2 as tables
+from django.template import Context, Template
+from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 
+from .templatetags.helpers import fgcolor
+
 
 class BaseTable(tables.Table):
     """
@@ -19,6 +23,35 @@ class BaseTable(tables.Table):
         }
 
 
+class TemplateColumn(tables.TemplateColumn):
+    """
+    Extend TemplateColumn to compile each template_code once, rather than each time a cell is rendered. Compiled
+    templates are shared by all columns (and all copies of a column) with the same template code.
+    """
+    _templates = {}
+
+    def render(self, record, table, value, bound_column, **kwargs):
+        if not self.template_code:
+            return super().render(record, table, value, bound_column, **kwargs)
+        template = self._templates.get(self.template_code)
+        if template is None:
+            template = self._templates[self.template_code] = Template(self.template_code)
+
+        # If the table is being rendered using render_table, django-tables2 attaches the context to the table
+        context = getattr(table, 'context', Context())
+        context.update({
+            'default': bound_column.default,
+            'column': bound_column,
+            'record': record,
+            'value': value,
+            'row_counter': kwargs['bound_row'].row_counter,
+        })
+        try:
+            return template.render(context)
+        finally:
+            context.pop()
+
+
 class ToggleColumn(tables.CheckBoxColumn):
     """
     Extend CheckBoxColumn to add a "toggle all" checkbox in the column header.
@@ -56,3 +89,27 @@ class ColorColumn(tables.Column):
         return mark_safe(
             '<span class="label color-block" style="background-color: #{}">&nbsp;</span>'.format(value)
         )
+
+
+class ChoiceFieldColumn(tables.Column):
+    """
+    Render a choice field as a colored label, using the record's get_FOO_class() and get_FOO_display() methods.
+    """
+    def render(self, record, bound_column):
+        return format_html(
+            '<span class="label label-{}">{}</span>',
+            getattr(record, 'get_{}_class'.format(bound_column.name))(),
+            getattr(record, 'get_{}_display'.format(bound_column.name))()
+        )
+
+
+class ColoredLabelColumn(tables.Column):
+    """
+    Render a related object (e.g. a role) as a label in the object's color.
+    """
+    def render(self, value):
+        # fgcolor() returns an empty string for a color which is not in RRGGBB format
+        return format_html(
+            '<label class="label" style="color: {}; background-color: #{}">{}</label>',
+            fgcolor(value.color), value.color, value
+        )
@@ -9,7 +9,9 @@ from extras.api.customfields import CustomFieldModelSerializer
 from ipam.api.nested_serializers import NestedIPAddressSerializer, NestedVLANSerializer
 from ipam.models import VLAN
 from tenancy.api.nested_serializers import NestedTenantSerializer
-from utilities.api import ChoiceField, SerializedPKRelatedField, ValidatedModelSerializer
+from utilities.api import (
+    ChoiceField, SerializedPKRelatedField, TaggedObjectListSerializer, ValidatedModelSerializer,
+)
 from virtualization.constants import VM_STATUS_CHOICES
 from virtualization.models import Cluster, ClusterGroup, ClusterType, VirtualMachine
 from .nested_serializers import *
@@ -45,6 +47,7 @@ class ClusterSerializer(TaggitSerializer, CustomFieldModelSerializer):
 
     class Meta:
         model = Cluster
+        list_serializer_class = TaggedObjectListSerializer
         fields = [
             'id', 'name', 'type', 'group', 'site', 'comments', 'tags', 'custom_fields', 'created', 'last_updated',
             'device_count', 'virtualmachine_count',
@@ -69,6 +72,7 @@ class VirtualMachineSerializer(TaggitSerializer, CustomFieldModelSerializer):
 
     class Meta:
         model = VirtualMachine
+        list_serializer_class = TaggedObjectListSerializer
         fields = [
             'id', 'name', 'status', 'site', 'cluster', 'role', 'tenant', 'platform', 'primary_ip', 'primary_ip4',
             'primary_ip6', 'vcpus', 'memory', 'disk', 'comments', 'local_context_data', 'tags', 'custom_fields',
@@ -110,6 +114,7 @@ class InterfaceSerializer(TaggitSerializer, ValidatedModelSerializer):
 
     class Meta:
         model = Interface
+        list_serializer_class = TaggedObjectListSerializer
         fields = [
             'id', 'virtual_machine', 'name', 'type', 'enabled', 'mtu', 'mac_address', 'description', 'mode',
             'untagged_vlan', 'tagged_vlans', 'tags',
@@ -110,7 +110,7 @@ class ClusterView(PermissionRequiredMixin, View):
 
         cluster = get_object_or_404(Cluster, pk=pk)
         devices = Device.objects.filter(cluster=cluster).select_related(
-            'site', 'rack', 'tenant', 'device_type__manufacturer'
+            'site', 'rack', 'tenant', 'device_role', 'device_type__manufacturer'
         )
         device_table = DeviceTable(list(devices), orderable=False)
         if request.user.has_perm('virtualization.change_cluster'):
@@ -235,7 +235,9 @@ class ClusterRemoveDevicesView(PermissionRequiredMixin, View):
         else:
             form = self.form(initial={'pk': request.POST.getlist('pk')})
 
-        selected_objects = Device.objects.filter(pk__in=form.initial['pk'])
+        selected_objects = Device.objects.filter(pk__in=form.initial['pk']).select_related(
+            'site', 'rack', 'tenant', 'device_role', 'device_type__manufacturer'
+        )
         device_table = DeviceTable(list(selected_objects), orderable=False)
 
         return render(request, self.template_name, {
@@ -6,6 +6,7 @@ rm v2.6.2.tar.gz
 cp -R ./temp/netbox/* ./netbox/
 cp ./temp/requirements.txt .
 echo napalm >> requirements.txt
+echo orjson >> requirements.txt
 echo gunicorn >> requirements.txt
 echo whitenoise >> requirements.txt
 echo python-dotenv >> requirements.txt